@@ -1,4 +1,4 @@
-from .core import Swarm
+from .core import Swarm, AsyncSwarm
 from .types import Agent, Response
 
-__all__ = ["Swarm", "Agent", "Response"]
+__all__ = ["Swarm", "AsyncSwarm", "Agent", "Response"]
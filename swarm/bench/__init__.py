@@ -0,0 +1,13 @@
+from .mock import AsyncScriptedClient, LatencyProfile, ScriptedClient
+from .suite import BenchResult, compare, load_baseline, run_suite, save_baseline
+
+__all__ = [
+    "AsyncScriptedClient",
+    "LatencyProfile",
+    "ScriptedClient",
+    "BenchResult",
+    "compare",
+    "load_baseline",
+    "run_suite",
+    "save_baseline",
+]
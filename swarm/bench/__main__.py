@@ -0,0 +1,43 @@
+import argparse
+import sys
+
+from .suite import compare, load_baseline, run_suite, save_baseline
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m swarm.bench",
+        description="Measure Swarm's orchestration overhead against a zero-latency client.",
+    )
+    parser.add_argument("--quick", action="store_true", help="run one or two scales per benchmark")
+    parser.add_argument("-k", "--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="seconds to time each benchmark (default 0.5)"
+    )
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline file")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown that counts as a regression (default 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    results = run_suite(
+        quick=args.quick, filter=args.filter, min_time=args.min_time, baseline=baseline
+    )
+    if args.save:
+        save_baseline(results, args.save)
+    if baseline is None:
+        return 0
+
+    regressions = [r for r, _, regressed in compare(results, baseline, args.threshold) if regressed]
+    for result in regressions:
+        print(f"regression: {result.name}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
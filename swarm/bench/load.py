@@ -0,0 +1,294 @@
+"""
+Drives simulated users through multi-turn conversations with an agent
+graph, against a latency-injecting mock model, and reports how many
+conversations one worker sustains:
+
+    python -m swarm.bench.load examples/triage_agent/agents.py --users 200 --turns 5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from pydantic import BaseModel
+
+from swarm import Agent, AsyncSwarm
+
+from .mock import AsyncScriptedClient, LatencyProfile, chunks, completion
+
+_PLACEHOLDERS = {
+    "string": "ABC123",
+    "integer": 1,
+    "number": 1.0,
+    "boolean": True,
+    "array": [],
+    "object": {},
+    "null": None,
+}
+
+
+class AgentGraphClient(AsyncScriptedClient):
+    """
+    A mock model that walks whatever agent graph it is given. Answering a
+    user message, it calls one of the offered tools with `tool_rate`
+    probability (placeholder arguments from the tool's schema), and
+    otherwise replies with `reply_tokens` words; after tool results it
+    always replies.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyProfile = None,
+        tool_rate: float = 0.5,
+        reply_tokens: int = 50,
+        chunk_size: int = 4,
+        seed: int = None,
+        model: str = "gpt-4o",
+    ):
+        super().__init__([], model=model, chunk_size=chunk_size, latency=latency)
+        self.tool_rate = tool_rate
+        self.reply = {"content": "word " * reply_tokens}
+        self.model = model
+        self.chunk_size = chunk_size
+        self._random = random.Random(seed)
+
+    def _next(self, params: dict):
+        with self._lock:
+            self.requests += 1
+            tools = params.get("tools") or []
+            message = self.reply
+            if (
+                tools
+                and params["messages"][-1]["role"] == "user"
+                and self._random.random() < self.tool_rate
+            ):
+                function = self._random.choice(tools)["function"]
+                properties = function["parameters"]["properties"]
+                args = {
+                    name: _PLACEHOLDERS.get(properties[name].get("type"), "ABC123")
+                    for name in function["parameters"].get("required", [])
+                }
+                message = {"content": "", "tool_calls": [{"name": function["name"], "args": args}]}
+        return completion(message, self.model), chunks(message, self.model, self.chunk_size)
+
+
+class LoadReport(BaseModel):
+    """
+    The outcome of a load run. Latencies are in milliseconds.
+
+    Attributes:
+        users (int): Simulated concurrent users (conversations).
+        turns (int): User turns completed.
+        errors (int): User turns that raised.
+        requests (int): Completions requested from the mock model.
+        duration (float): Wall-clock seconds for the whole run.
+        turns_per_sec (float): Completed user turns per second.
+        turn_latency (dict): p50/p95/p99 of the time to answer a user turn.
+        ttft (dict): p50/p95/p99 of the time to the first streamed delta.
+        memory_per_conversation_kib (float): Memory growth divided by users.
+            The peak traced by `tracemalloc` with `trace_memory`, and
+            the maximum resident set size otherwise.
+    """
+
+    users: int
+    turns: int
+    errors: int
+    requests: int
+    duration: float
+    turns_per_sec: float
+    turn_latency: dict
+    ttft: dict
+    memory_per_conversation_kib: float
+
+
+def percentiles(samples: List[float]) -> dict:
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+def load_agent(path: str, name: str = None) -> Agent:
+    """
+    Imports an agents module from a file and returns the agent called
+    `name`, or `triage_agent`, or the first agent defined in it.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    # example graphs import their siblings relative to these directories
+    for entry in (os.path.dirname(directory), directory):
+        if entry not in sys.path:
+            sys.path.insert(0, entry)
+    spec = importlib.util.spec_from_file_location("swarm_load_agents", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    if name:
+        return getattr(module, name)
+    if isinstance(getattr(module, "triage_agent", None), Agent):
+        return module.triage_agent
+    agents = [value for value in vars(module).values() if isinstance(value, Agent)]
+    if not agents:
+        raise ValueError(f"No Agent defined in {path}")
+    return agents[0]
+
+
+async def simulate_user(swarm: AsyncSwarm, agent: Agent, user: int, turns: int, stats: dict):
+    messages = []
+    context_variables = {}
+    for turn in range(turns):
+        messages.append(
+            {"role": "user", "content": f"User {user}, message {turn}: I need some help."}
+        )
+        start = time.perf_counter()
+        first_delta = None
+        try:
+            stream = await swarm.run(
+                agent=agent, messages=messages, context_variables=context_variables, stream=True
+            )
+            async for event in stream:
+                if first_delta is None and "delim" not in event:
+                    first_delta = time.perf_counter() - start
+                if "response" in event:
+                    response = event["response"]
+        except Exception:
+            stats["errors"] += 1
+            continue
+        stats["latencies"].append(time.perf_counter() - start)
+        if first_delta is not None:
+            stats["ttft"].append(first_delta)
+        messages.extend(response.messages)
+        context_variables = response.context_variables
+        agent = response.agent
+
+
+async def run_load(
+    agent: Agent,
+    users: int = 100,
+    turns: int = 5,
+    latency: LatencyProfile = None,
+    tool_rate: float = 0.5,
+    reply_tokens: int = 50,
+    concurrent_tools: bool = False,
+    trace_memory: bool = False,
+    seed: int = None,
+) -> LoadReport:
+    """
+    Runs `users` concurrent conversations of `turns` user turns each,
+    starting at `agent`, on the current event loop.
+    """
+    client = AgentGraphClient(
+        latency=latency, tool_rate=tool_rate, reply_tokens=reply_tokens, seed=seed
+    )
+    swarm = AsyncSwarm(client=client, concurrent_tools=concurrent_tools)
+    stats = {"latencies": [], "ttft": [], "errors": 0}
+
+    if trace_memory:
+        tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    # agent functions often print; keep their output out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        await asyncio.gather(
+            *[simulate_user(swarm, agent, user, turns, stats) for user in range(users)]
+        )
+    duration = time.perf_counter() - start
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory_kib = peak / 1024
+    else:
+        # ru_maxrss is in KiB on Linux
+        memory_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+    return LoadReport(
+        users=users,
+        turns=len(stats["latencies"]),
+        errors=stats["errors"],
+        requests=client.requests,
+        duration=duration,
+        turns_per_sec=len(stats["latencies"]) / duration,
+        turn_latency=percentiles(stats["latencies"]),
+        ttft=percentiles(stats["ttft"]),
+        memory_per_conversation_kib=memory_kib / users,
+    )
+
+
+def format_report(report: LoadReport) -> str:
+    def row(label, values):
+        return f"{label:<18} " + "  ".join(f"{k} {v:>9,.1f} ms" for k, v in values.items())
+
+    return "\n".join(
+        [
+            f"{'users':<18} {report.users}",
+            f"{'turns':<18} {report.turns} ({report.errors} errors, {report.requests} completions)",
+            f"{'duration':<18} {report.duration:,.2f} s",
+            f"{'throughput':<18} {report.turns_per_sec:,.1f} turns/s",
+            row("turn latency", report.turn_latency),
+            row("ttft", report.ttft),
+            f"{'memory':<18} {report.memory_per_conversation_kib:,.1f} KiB per conversation",
+        ]
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m swarm.bench.load",
+        description="Simulate concurrent users against an agent graph with a mock model.",
+    )
+    parser.add_argument("agents", help="path to a module defining the agent graph")
+    parser.add_argument("--agent", help="the starting agent's variable name (default triage_agent)")
+    parser.add_argument("--users", type=int, default=100, help="concurrent conversations")
+    parser.add_argument("--turns", type=int, default=5, help="user turns per conversation")
+    parser.add_argument("--ttft", type=float, default=0.3, help="model time to first token, seconds")
+    parser.add_argument("--inter-token", type=float, default=0.01, help="seconds between chunks")
+    parser.add_argument("--jitter", type=float, default=0.2, help="relative latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability a request fails")
+    parser.add_argument("--tool-rate", type=float, default=0.5,
+                        help="probability the model calls a tool when answering a user")
+    parser.add_argument("--reply-tokens", type=int, default=50, help="words per model reply")
+    parser.add_argument("--concurrent-tools", action="store_true",
+                        help="run agent functions on worker threads")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="measure memory with tracemalloc (slower, more precise)")
+    parser.add_argument("--seed", type=int, help="seed the mock model for repeatable runs")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    agent = load_agent(args.agents, args.agent)
+    latency = LatencyProfile(
+        ttft=args.ttft,
+        inter_token=args.inter_token,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    report = asyncio.run(
+        run_load(
+            agent,
+            users=args.users,
+            turns=args.turns,
+            latency=latency,
+            tool_rate=args.tool_rate,
+            reply_tokens=args.reply_tokens,
+            concurrent_tools=args.concurrent_tools,
+            trace_memory=args.trace_memory,
+            seed=args.seed,
+        )
+    )
+    print(json.dumps(report.model_dump(), indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
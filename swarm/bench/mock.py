@@ -0,0 +1,213 @@
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+import httpx
+import openai
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from ..cache import completion_to_chunks
+
+
+def completion(message: dict, model: str = "gpt-4o", usage: dict = None) -> ChatCompletion:
+    """
+    Builds a `ChatCompletion` from a scripted assistant message:
+    `{"content": str, "tool_calls": [{"name": str, "args": dict}, ...]}`.
+    """
+    tool_calls = [
+        {
+            "id": f"call_{index}",
+            "type": "function",
+            "function": {"name": call["name"], "arguments": json.dumps(call.get("args", {}))},
+        }
+        for index, call in enumerate(message.get("tool_calls") or [])
+    ]
+    return ChatCompletion.model_validate(
+        {
+            "id": "bench",
+            "created": 0,
+            "model": model,
+            "object": "chat.completion",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "tool_calls" if tool_calls else "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": message.get("content", ""),
+                        "tool_calls": tool_calls or None,
+                    },
+                }
+            ],
+            "usage": usage,
+        }
+    )
+
+
+def chunks(
+    message: dict, model: str = "gpt-4o", chunk_size: int = 4, usage: dict = None
+) -> List[ChatCompletionChunk]:
+    """
+    Splits a scripted assistant message into the `ChatCompletionChunk`s a
+    streamed completion would deliver: content in `chunk_size` character
+    pieces, then each tool call with its arguments in `chunk_size` pieces.
+    With `usage`, a last chunk without choices carries it, as with
+    `stream_options={"include_usage": True}`.
+    """
+    full = completion(message, model, usage).model_dump()
+    return [
+        ChatCompletionChunk.model_validate(chunk)
+        for chunk in completion_to_chunks(full, chunk_size)
+    ]
+
+
+class LatencyProfile:
+    """
+    Simulated model latency for `ScriptedClient` and `AsyncScriptedClient`.
+
+    Args:
+        ttft: Seconds before the first chunk (or the whole completion) arrives.
+        inter_token: Seconds between two chunks. A regular completion waits
+            for all of its chunks to be generated.
+        jitter: Each delay is scaled by a random factor in [1 - jitter, 1 + jitter].
+        error_rate: The probability that a request fails before responding.
+        stream_error_rate: The probability that a stream fails partway through.
+        error: Builds the exception raised for injected failures.
+        seed: Seeds the random jitter and failures, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        ttft: float = 0.0,
+        inter_token: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        stream_error_rate: float = 0.0,
+        error: Callable[[], BaseException] = None,
+        seed: int = None,
+    ):
+        self.ttft = ttft
+        self.inter_token = inter_token
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stream_error_rate = stream_error_rate
+        self.error = error or _connection_error
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, seconds: float) -> float:
+        if not self.jitter or not seconds:
+            return seconds
+        with self._lock:
+            return seconds * self._random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def fails(self, rate: float) -> bool:
+        if not rate:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def failure_point(self, length: int) -> Optional[int]:
+        # the chunk before which an injected stream failure happens, if any
+        if not self.fails(self.stream_error_rate):
+            return None
+        with self._lock:
+            return self._random.randrange(1, max(length, 2))
+
+
+def _connection_error() -> BaseException:
+    return openai.APIConnectionError(
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    )
+
+
+class ScriptedClient:
+    """
+    A stand-in for `OpenAI` that answers `chat.completions.create` with
+    scripted messages, in order and cycling, streamed or not. Responses are
+    built once up front; without a `latency` profile the client costs next
+    to nothing, so a benchmark measures only the caller.
+
+    Args:
+        script: Assistant messages, as accepted by `completion`.
+        model: The model reported by the responses.
+        chunk_size: Characters per content or argument chunk when streaming.
+        latency: A `LatencyProfile` of delays and failures to simulate.
+    """
+
+    def __init__(
+        self,
+        script: List[dict],
+        model: str = "gpt-4o",
+        chunk_size: int = 4,
+        latency: LatencyProfile = None,
+    ):
+        self.requests = 0
+        self.latency = latency
+        self._responses = itertools.cycle(
+            [(completion(m, model), chunks(m, model, chunk_size)) for m in script]
+        )
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _next(self, params: dict):
+        # the (completion, chunks) answering a request
+        with self._lock:
+            self.requests += 1
+            return next(self._responses)
+
+    def create(self, stream: bool = False, **params):
+        response, stream_chunks = self._next(params)
+        latency = self.latency
+        if latency is None:
+            return iter(stream_chunks) if stream else response
+
+        time.sleep(latency.delay(latency.ttft))
+        if latency.fails(latency.error_rate):
+            raise latency.error()
+        if stream:
+            return self._stream(stream_chunks, latency)
+        time.sleep(latency.delay(latency.inter_token * (len(stream_chunks) - 1)))
+        return response
+
+    def _stream(self, stream_chunks, latency):
+        failure = latency.failure_point(len(stream_chunks))
+        for index, chunk in enumerate(stream_chunks):
+            if index and latency.inter_token:
+                time.sleep(latency.delay(latency.inter_token))
+            if index == failure:
+                raise latency.error()
+            yield chunk
+
+
+class AsyncScriptedClient(ScriptedClient):
+    """
+    The `AsyncOpenAI` counterpart of `ScriptedClient`; delays use
+    `asyncio.sleep`, so many simulated requests can wait concurrently.
+    """
+
+    async def create(self, stream: bool = False, **params):
+        response, stream_chunks = self._next(params)
+        latency = self.latency or LatencyProfile()
+
+        await asyncio.sleep(latency.delay(latency.ttft))
+        if latency.fails(latency.error_rate):
+            raise latency.error()
+        if stream:
+            return self._astream(stream_chunks, latency)
+        await asyncio.sleep(latency.delay(latency.inter_token * (len(stream_chunks) - 1)))
+        return response
+
+    async def _astream(self, stream_chunks, latency):
+        failure = latency.failure_point(len(stream_chunks))
+        for index, chunk in enumerate(stream_chunks):
+            if index and latency.inter_token:
+                await asyncio.sleep(latency.delay(latency.inter_token))
+            if index == failure:
+                raise latency.error()
+            yield chunk
@@ -0,0 +1,269 @@
+import json
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from swarm import Agent, Swarm
+from swarm.types import ChatCompletionMessageToolCall, Function
+from swarm.util import StreamAccumulator, function_to_json, merge_chunk
+
+from .mock import ScriptedClient
+
+
+class Benchmark(BaseModel):
+    """
+    A benchmark scenario. `setup` prepares everything outside the timed
+    region and returns the operation to time and the number of turns
+    (completions) that one operation runs.
+    """
+
+    name: str
+    setup: Callable[[], Tuple[Callable[[], object], int]]
+    quick: bool = False
+
+
+class BenchResult(BaseModel):
+    """
+    The measurements of one benchmark.
+
+    Attributes:
+        name (str): The benchmark name, e.g. "run[history=1000]".
+        ops (int): How many times the operation ran while timing.
+        ops_per_sec (float): Operations per second.
+        us_per_turn (float): Microseconds per turn, or per call for
+            benchmarks of a single function.
+        peak_kib (float): Peak memory allocated during one operation, in KiB.
+    """
+
+    name: str
+    ops: int
+    ops_per_sec: float
+    us_per_turn: float
+    peak_kib: float
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, parameter: str, scales: list, quick: tuple = ()):
+    """Registers a setup function once per scale, as `name[parameter=scale]`."""
+
+    def register(setup):
+        for scale in scales:
+            BENCHMARKS.append(
+                Benchmark(
+                    name=f"{name}[{parameter}={scale}]",
+                    setup=lambda scale=scale: setup(scale),
+                    quick=scale in quick,
+                )
+            )
+        return setup
+
+    return register
+
+
+def make_tools(n: int) -> list:
+    tools = []
+    for i in range(n):
+
+        def tool(query: str, limit: int = 10, exact: bool = False):
+            """Looks up records matching a query."""
+            return f"{query}:{limit}"
+
+        tool.__name__ = tool.__qualname__ = f"tool_{i}"
+        tools.append(tool)
+    return tools
+
+
+def make_history(n: int) -> list:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " * 8}
+        for i in range(n)
+    ]
+
+
+def reply(content: str = "Done.", tool_calls: list = None) -> dict:
+    return {"content": content, "tool_calls": tool_calls}
+
+
+USER_MESSAGE = [{"role": "user", "content": "Hello"}]
+
+
+@benchmark("function_to_json", "tools", [1, 10, 100, 500], quick=(10,))
+def bench_function_to_json(n):
+    tools = make_tools(n)
+    return lambda: [function_to_json(tool) for tool in tools], 1
+
+
+@benchmark("run", "tools", [1, 10, 100, 500], quick=(1, 100))
+def bench_run_tools(n):
+    client = Swarm(client=ScriptedClient([reply()]))
+    agent = Agent(functions=make_tools(n))
+    return lambda: client.run(agent=agent, messages=USER_MESSAGE), 1
+
+
+@benchmark("run", "history", [10, 100, 1000, 10000], quick=(10, 1000))
+def bench_run_history(n):
+    client = Swarm(client=ScriptedClient([reply()]))
+    agent = Agent()
+    messages = make_history(n)
+    return lambda: client.run(agent=agent, messages=messages), 1
+
+
+@benchmark("run", "parallel_tool_calls", [1, 10, 50], quick=(10,))
+def bench_run_parallel_tool_calls(n):
+    calls = [{"name": f"tool_{i % 10}", "args": {"query": f"q{i}"}} for i in range(n)]
+    client = Swarm(client=ScriptedClient([reply("", calls), reply()]))
+    agent = Agent(functions=make_tools(10))
+    return lambda: client.run(agent=agent, messages=USER_MESSAGE), 2
+
+
+@benchmark("handle_tool_calls", "calls", [1, 10, 50], quick=(10,))
+def bench_handle_tool_calls(n):
+    client = Swarm(client=ScriptedClient([reply()]))
+    tools = make_tools(10)
+    tool_calls = [
+        ChatCompletionMessageToolCall(
+            id=f"call_{i}",
+            type="function",
+            function=Function(name=f"tool_{i % 10}", arguments=json.dumps({"query": f"q{i}"})),
+        )
+        for i in range(n)
+    ]
+    return lambda: client.handle_tool_calls(tool_calls, tools, {}, debug=False), 1
+
+
+@benchmark("run_and_stream", "chunks", [100, 1000, 10000], quick=(1000,))
+def bench_run_and_stream(n):
+    # 4 characters per chunk, plus the opening role chunk
+    client = Swarm(client=ScriptedClient([reply("abcd" * (n - 1))]))
+    agent = Agent()
+    return lambda: list(client.run(agent=agent, messages=USER_MESSAGE, stream=True)), 1
+
+
+@benchmark("merge_chunk", "chunks", [100, 1000, 10000], quick=(1000,))
+def bench_merge_chunk(n):
+    deltas = [{"content": "abcd"} for _ in range(n)]
+
+    def merge():
+        message = {"content": "", "sender": "Agent", "role": "assistant", "tool_calls": {}}
+        for delta in deltas:
+            merge_chunk(message, delta)
+        return message
+
+    return merge, 1
+
+
+@benchmark("StreamAccumulator", "chunks", [100, 1000, 10000], quick=(1000,))
+def bench_stream_accumulator(n):
+    deltas = [{"content": "abcd"} for _ in range(n)]
+
+    def accumulate():
+        accumulator = StreamAccumulator(sender="Agent")
+        for delta in deltas:
+            accumulator.add(delta)
+        return accumulator.message()
+
+    return accumulate, 1
+
+
+def measure(bench: Benchmark, min_time: float = 0.5) -> BenchResult:
+    """
+    Times `bench` for at least `min_time` seconds after one warm-up call,
+    then measures the peak memory of a single extra call.
+    """
+    operation, turns = bench.setup()
+    operation()
+    ops = 0
+    start = time.perf_counter()
+    while True:
+        operation()
+        ops += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(
+        name=bench.name,
+        ops=ops,
+        ops_per_sec=ops / elapsed,
+        us_per_turn=elapsed / ops / turns * 1e6,
+        peak_kib=peak / 1024,
+    )
+
+
+def run_suite(
+    quick: bool = False,
+    filter: str = None,
+    min_time: float = 0.5,
+    baseline: Dict[str, BenchResult] = None,
+    verbose: bool = True,
+) -> List[BenchResult]:
+    """
+    Runs the registered benchmarks. With `verbose`, prints each result as
+    it completes, with its change against `baseline` when one is given.
+    """
+    results = []
+    for bench in BENCHMARKS:
+        if quick and not bench.quick:
+            continue
+        if filter and filter not in bench.name:
+            continue
+        result = measure(bench, min_time)
+        results.append(result)
+        if verbose:
+            before = (baseline or {}).get(result.name)
+            change = f"{result.us_per_turn / before.us_per_turn - 1:+.1%}" if before else ""
+            print(format_result(result, change), flush=True)
+    return results
+
+
+def format_result(result: BenchResult, change: str = "") -> str:
+    return (
+        f"{result.name:<36} {result.ops_per_sec:>12,.1f} ops/s "
+        f"{result.us_per_turn:>12,.1f} µs/turn {result.peak_kib:>10,.1f} KiB  {change}"
+    ).rstrip()
+
+
+def save_baseline(results: List[BenchResult], path: str) -> None:
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [result.model_dump() for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, BenchResult]:
+    with open(path) as f:
+        data = json.load(f)
+    return {r["name"]: BenchResult(**r) for r in data["results"]}
+
+
+def compare(
+    results: List[BenchResult], baseline: Dict[str, BenchResult], threshold: float = 0.1
+) -> List[Tuple[BenchResult, float, bool]]:
+    """
+    Returns `(result, change, regressed)` for each result that has a
+    baseline, where `change` is the relative change in µs per turn and a
+    result regressed if it is more than `threshold` slower.
+    """
+    comparisons = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None:
+            continue
+        change = result.us_per_turn / before.us_per_turn - 1
+        comparisons.append((result, change, change > threshold))
+    return comparisons
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Iterator, List, Optional, Union
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from .util import StreamAccumulator
+
+CACHE_KEY_FIELDS = ("model", "messages", "tools", "tool_choice", "parallel_tool_calls")
+
+
+def request_key(create_params: dict) -> str:
+    """
+    Returns a canonical hash of the parts of a `chat.completions.create`
+    request that determine its response. `stream` is deliberately left out:
+    a cached completion can be replayed either streamed or not.
+    """
+    payload = {field: create_params.get(field) for field in CACHE_KEY_FIELDS}
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def completion_to_chunks(completion: dict, chunk_size: int = None) -> List[dict]:
+    """
+    Splits a completion (as a dict) into the chunks a stream of it would
+    deliver. With `chunk_size`, content and each tool call's arguments
+    arrive in pieces of that many characters; otherwise each arrives whole,
+    in the chunk that opens it.
+    """
+
+    def split(text):
+        if chunk_size is None:
+            return text, []
+        return "", [text[i: i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+    message = completion["choices"][0]["message"]
+    base = {
+        "id": completion["id"],
+        "created": completion["created"],
+        "model": completion["model"],
+        "object": "chat.completion.chunk",
+    }
+
+    def chunk(delta):
+        return {**base, "choices": [{"index": 0, "delta": delta}]}
+
+    content, pieces = split(message.get("content") or "")
+    chunks = [chunk({"role": "assistant", "content": content})]
+    chunks += [chunk({"content": piece}) for piece in pieces]
+    for index, tool_call in enumerate(message.get("tool_calls") or []):
+        function = tool_call["function"]
+        arguments, pieces = split(function.get("arguments") or "")
+        opening = {
+            "index": index,
+            "id": tool_call["id"],
+            "type": tool_call.get("type", "function"),
+            "function": {"name": function["name"], "arguments": arguments},
+        }
+        chunks.append(chunk({"tool_calls": [opening]}))
+        chunks += [
+            chunk({"tool_calls": [{"index": index, "function": {"arguments": piece}}]})
+            for piece in pieces
+        ]
+    chunks[-1]["choices"][0]["finish_reason"] = completion["choices"][0].get(
+        "finish_reason"
+    )
+    if completion.get("usage"):
+        chunks.append({**base, "choices": [], "usage": completion["usage"]})
+    return chunks
+
+
+def chunks_to_completion(chunks: List[dict]) -> dict:
+    # reassemble a recorded stream into a single response
+    accumulator = StreamAccumulator(sender=None)
+    finish_reason = "stop"
+    usage = None
+    for chunk in chunks:
+        usage = chunk.get("usage") or usage
+        for choice in chunk["choices"]:
+            accumulator.add(choice["delta"])
+            finish_reason = choice.get("finish_reason") or finish_reason
+    message = accumulator.message()
+    return {
+        "id": chunks[0]["id"],
+        "created": chunks[0]["created"],
+        "model": chunks[0]["model"],
+        "object": "chat.completion",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": finish_reason,
+                "message": {
+                    "role": "assistant",
+                    "content": message["content"],
+                    "tool_calls": message["tool_calls"],
+                },
+            }
+        ],
+        "usage": usage,
+    }
+
+
+class CompletionCache:
+    """
+    Caches chat completions by request, in an in-memory LRU tier and
+    optionally a persistent SQLite tier. Pass one to `Swarm(cache=...)`.
+
+    Args:
+        path: SQLite database file for the persistent tier. In-memory only if None.
+        max_entries: The number of entries kept in the in-memory tier.
+    """
+
+    def __init__(self, path: str = None, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Returns the cached entry for `key`, as `{"completion": dict}` or
+        `{"chunks": [dict, ...]}`, or None.
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    value = row[0]
+                    self._remember(key, value)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, entry: dict) -> None:
+        value = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO completions (key, value) VALUES (?, ?)",
+                    (key, value),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM completions")
+                self._db.commit()
+
+    def _remember(self, key: str, value: str) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def replay(self, entry: dict, stream: bool) -> Union[ChatCompletion, Iterator]:
+        if stream:
+            chunks = entry.get("chunks") or completion_to_chunks(entry["completion"])
+            return (ChatCompletionChunk.model_validate(chunk) for chunk in chunks)
+        completion = entry.get("completion") or chunks_to_completion(entry["chunks"])
+        return ChatCompletion.model_validate(completion)
+
+    async def areplay(self, entry: dict, stream: bool):
+        completion = self.replay(entry, stream)
+        if not stream:
+            return completion
+
+        async def chunks():
+            for chunk in completion:
+                yield chunk
+
+        return chunks()
+
+    def store(self, key: str, completion: ChatCompletion) -> None:
+        self.set(key, {"completion": completion.model_dump(mode="json")})
+
+    def record(self, key: str, stream: Iterator) -> Iterator:
+        """
+        Passes a streamed completion through, caching its chunks once the
+        stream has been fully consumed.
+        """
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk.model_dump(mode="json"))
+            yield chunk
+        if chunks:
+            self.set(key, {"chunks": chunks})
+
+    async def arecord(self, key: str, stream: AsyncIterator) -> AsyncIterator:
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk.model_dump(mode="json"))
+            yield chunk
+        if chunks:
+            self.set(key, {"chunks": chunks})
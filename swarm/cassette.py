@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict, deque
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from .cache import chunks_to_completion, completion_to_chunks, request_key
+
+
+class Cassette:
+    """
+    Records chat completion traffic to a JSONL file, or replays it without
+    the network. Use it in place of the client passed to `Swarm(client=...)`.
+
+    Each line holds one response, keyed by the same request hash as
+    `CompletionCache`, with its latency and, for streams, every chunk with
+    its offset from the start of the request.
+
+    Args:
+        path: The cassette file.
+        mode: "record" to call `client` and append to the file, "replay" to serve from it.
+        client: The OpenAI client to record from (record mode only).
+        realtime: In replay mode, reproduce the recorded latencies instead of
+            returning as fast as possible.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", client=None, realtime: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == "record" and client is None:
+            raise ValueError("A client is required to record a cassette.")
+        self.path = path
+        self.mode = mode
+        self.client = client
+        self.realtime = realtime
+        # swarm calls client.chat.completions.create
+        self.chat = self
+        self.completions = self
+        self._lock = threading.Lock()
+        self._entries = defaultdict(deque)
+        if mode == "replay":
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]].append(entry)
+
+    def create(self, **create_params):
+        key = request_key(create_params)
+        stream = create_params.get("stream", False)
+        if self.mode == "replay":
+            return self._replay(self._next_entry(key), stream)
+
+        start = time.perf_counter()
+        completion = self.client.chat.completions.create(**create_params)
+        if stream:
+            return self._record_stream(key, create_params, start, completion)
+        self._write(key, create_params, time.perf_counter() - start, completion=completion)
+        return completion
+
+    def _next_entry(self, key: str) -> dict:
+        # identical requests are replayed in the order they were recorded
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise KeyError(f"No recorded response for request {key} in {self.path}.")
+            return entries.popleft() if len(entries) > 1 else entries[0]
+
+    def _record_stream(self, key, create_params, start, completion):
+        chunks = []
+        for chunk in completion:
+            chunks.append((time.perf_counter(), chunk))
+            yield chunk
+        self._write(key, create_params, time.perf_counter() - start, chunks=chunks, start=start)
+
+    def _write(self, key, create_params, latency, completion=None, chunks=None, start=None):
+        entry = {"key": key, "model": create_params.get("model"), "latency": round(latency, 6)}
+        if completion is not None:
+            entry["completion"] = completion.model_dump(mode="json")
+        else:
+            entry["chunks"] = [
+                [round(offset - start, 6), chunk.model_dump(mode="json")]
+                for offset, chunk in chunks
+            ]
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+    def _timed_chunks(self, entry: dict) -> list:
+        if "chunks" in entry:
+            return entry["chunks"]
+        return [[entry["latency"], chunk] for chunk in completion_to_chunks(entry["completion"])]
+
+    def _completion(self, entry: dict) -> dict:
+        if "completion" in entry:
+            return entry["completion"]
+        return chunks_to_completion([chunk for _, chunk in entry["chunks"]])
+
+    def _replay(self, entry: dict, stream: bool):
+        if not stream:
+            if self.realtime:
+                time.sleep(entry["latency"])
+            return ChatCompletion.model_validate(self._completion(entry))
+        return self._replay_stream(entry)
+
+    def _replay_stream(self, entry: dict):
+        start = time.perf_counter()
+        for offset, chunk in self._timed_chunks(entry):
+            if self.realtime:
+                time.sleep(max(0.0, offset - (time.perf_counter() - start)))
+            yield ChatCompletionChunk.model_validate(chunk)
+
+
+class AsyncCassette(Cassette):
+    """
+    The `Cassette` counterpart for `AsyncSwarm` and `AsyncOpenAI` clients.
+    """
+
+    async def create(self, **create_params):
+        key = request_key(create_params)
+        stream = create_params.get("stream", False)
+        if self.mode == "replay":
+            entry = self._next_entry(key)
+            if not stream:
+                if self.realtime:
+                    await asyncio.sleep(entry["latency"])
+                return ChatCompletion.model_validate(self._completion(entry))
+            return self._areplay_stream(entry)
+
+        start = time.perf_counter()
+        completion = await self.client.chat.completions.create(**create_params)
+        if stream:
+            return self._arecord_stream(key, create_params, start, completion)
+        self._write(key, create_params, time.perf_counter() - start, completion=completion)
+        return completion
+
+    async def _arecord_stream(self, key, create_params, start, completion):
+        chunks = []
+        async for chunk in completion:
+            chunks.append((time.perf_counter(), chunk))
+            yield chunk
+        self._write(key, create_params, time.perf_counter() - start, chunks=chunks, start=start)
+
+    async def _areplay_stream(self, entry: dict):
+        start = time.perf_counter()
+        for offset, chunk in self._timed_chunks(entry):
+            if self.realtime:
+                await asyncio.sleep(max(0.0, offset - (time.perf_counter() - start)))
+            yield ChatCompletionChunk.model_validate(chunk)
@@ -0,0 +1,173 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+def _dumps(value, what: str, run_id: str) -> str:
+    # no default=str: a value that would come back as a different type
+    # after resuming must fail when it is saved instead
+    try:
+        return json.dumps(value)
+    except (TypeError, ValueError) as e:
+        raise TypeError(
+            f"Cannot checkpoint the {what} of run {run_id}: {e}. Checkpointed runs "
+            "need JSON-serializable messages and context_variables."
+        ) from e
+
+
+class RunState(BaseModel):
+    """
+    A checkpoint of a run, saved after every completion and after every
+    tool result when the client has a `checkpoint_store`.
+
+    Attributes:
+        run_id (str): Identifies the run in the store.
+        agent (str): The name of the active agent.
+        messages (List): The messages the run was started with.
+        new_messages (List): The messages the run has added so far.
+        context_variables (dict): The context variables so far.
+        pending_tool_calls (List): Tool calls of the last completion that
+            have not finished yet.
+        tool_context_variables (dict): Context variable updates returned by
+            the finished calls of that completion, not yet applied.
+        tool_handoff (str): The agent the finished calls of that completion
+            handed off to, not yet applied.
+        turn (int): The number of completions requested so far.
+        done (bool): Whether the run has finished.
+        model_override (str): The run's `model_override`.
+        max_turns (int): The run's `max_turns`, or None for no limit.
+        execute_tools (bool): The run's `execute_tools`.
+    """
+
+    run_id: str
+    agent: str
+    messages: List = []
+    new_messages: List = []
+    context_variables: dict = {}
+    pending_tool_calls: List = []
+    tool_context_variables: dict = {}
+    tool_handoff: Optional[str] = None
+    turn: int = 0
+    done: bool = False
+    model_override: Optional[str] = None
+    max_turns: Optional[int] = None
+    execute_tools: bool = True
+
+    def unfinished_batch(self) -> Optional[List]:
+        """
+        Returns the tool calls of an interrupted batch that still have to
+        run, possibly none when only the results of its finished calls are
+        left to apply, or None when no batch was interrupted.
+        """
+        if self.pending_tool_calls or self.tool_context_variables or self.tool_handoff:
+            return self.pending_tool_calls
+        return None
+
+    def dump_progress(self) -> str:
+        # everything but the input messages, which are saved only once
+        return _dumps(self.model_dump(exclude={"messages"}), "progress", self.run_id)
+
+
+class MemoryCheckpointStore:
+    """
+    Keeps checkpoints in this process; useful for tests. Share one
+    instance between threads. A run is deleted when it finishes, unless
+    `keep_finished` is set.
+    """
+
+    def __init__(self, keep_finished: bool = False):
+        self.keep_finished = keep_finished
+        self._lock = threading.Lock()
+        self._runs: Dict[str, list] = {}
+
+    def start(self, state: RunState) -> None:
+        """Saves the first checkpoint of a run, including its input messages."""
+        entry = [_dumps(state.messages, "messages", state.run_id), state.dump_progress()]
+        with self._lock:
+            self._runs[state.run_id] = entry
+
+    def save(self, state: RunState) -> None:
+        """Saves the progress of a run started with `start`."""
+        if state.done and not self.keep_finished:
+            return self.delete(state.run_id)
+        progress = state.dump_progress()
+        with self._lock:
+            self._runs[state.run_id][1] = progress
+
+    def load(self, run_id: str) -> Optional[RunState]:
+        with self._lock:
+            entry = self._runs.get(run_id)
+        if entry is None:
+            return None
+        return RunState(messages=json.loads(entry[0]), **json.loads(entry[1]))
+
+    def unfinished(self) -> List[str]:
+        with self._lock:
+            runs = list(self._runs.items())
+        return [run_id for run_id, (_, progress) in runs if not json.loads(progress)["done"]]
+
+    def delete(self, run_id: str) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+
+class SQLiteCheckpointStore:
+    """
+    Keeps checkpoints in a SQLite database, one row per run. The input
+    messages are written once, when the run starts; later checkpoints
+    rewrite only the run's progress. A run's row is deleted when it
+    finishes, unless `keep_finished` is set.
+    """
+
+    def __init__(self, path: str, keep_finished: bool = False):
+        self.keep_finished = keep_finished
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS run_states "
+            "(run_id TEXT PRIMARY KEY, messages TEXT, progress TEXT, done INTEGER)"
+        )
+        self._db.commit()
+
+    def start(self, state: RunState) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO run_states (run_id, messages, progress, done) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    state.run_id,
+                    _dumps(state.messages, "messages", state.run_id),
+                    state.dump_progress(),
+                    state.done,
+                ),
+            )
+
+    def save(self, state: RunState) -> None:
+        if state.done and not self.keep_finished:
+            return self.delete(state.run_id)
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE run_states SET progress = ?, done = ? WHERE run_id = ?",
+                (state.dump_progress(), state.done, state.run_id),
+            )
+
+    def load(self, run_id: str) -> Optional[RunState]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT messages, progress FROM run_states WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return RunState(messages=json.loads(row[0]), **json.loads(row[1]))
+
+    def unfinished(self) -> List[str]:
+        with self._lock:
+            rows = self._db.execute("SELECT run_id FROM run_states WHERE done = 0").fetchall()
+        return [run_id for (run_id,) in rows]
+
+    def delete(self, run_id: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM run_states WHERE run_id = ?", (run_id,))
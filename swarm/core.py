@@ -1,35 +1,499 @@
 # Standard library imports
-import copy
+import asyncio
+import functools
+import inspect
 import json
+import logging
+import weakref
 from collections import defaultdict
-from typing import List, Callable, Union
-
-# Package/library imports
-from openai import OpenAI
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Iterable, Iterator, List, Callable, Optional, Union
 
 
 # Local imports
-from .util import function_to_json, debug_print, merge_chunk
+from .cache import CompletionCache, request_key
+from .checkpoint import RunState
+from .history import History, HistoryPolicy
+from .hooks import (
+    NO_EVENTS,
+    RunEvents,
+    RunHooks,
+    emit_handoff,
+    emit_llm_end,
+    emit_tool_end,
+    emit_tool_start,
+    emit_with_context,
+    new_run_id,
+)
+from .log import log
+from .pool import PoolStats, pool_stats, pooled_async_client, pooled_client
+from .profiling import RunProfiler
+from .ratelimit import RateLimiter
+from .resilience import HedgePolicy, RetryPolicy
+from .session import AsyncSession, MemoryStore, Session
+from .util import (
+    function_to_json,
+    model_to_dict,
+    run_coroutine_sync,
+    StreamAccumulator,
+)
 from .types import (
     Agent,
     AgentFunction,
+    BatchResult,
     ChatCompletionMessage,
     ChatCompletionMessageToolCall,
     Function,
     Response,
     Result,
+    RunUsage,
+    Usage,
 )
 
 __CTX_VARS_NAME__ = "context_variables"
 
 
+# tool schemas per function, and each live agent's compiled payload by id
+# (agents are unhashable); neither keeps its key alive
+_tool_schemas = weakref.WeakKeyDictionary()
+_agent_tools = {}
+
+
+def _compile_tool_schema(func: AgentFunction) -> dict:
+    tool = function_to_json(func)
+    # hide context_variables from model
+    params = tool["function"]["parameters"]
+    params["properties"].pop(__CTX_VARS_NAME__, None)
+    if __CTX_VARS_NAME__ in params["required"]:
+        params["required"].remove(__CTX_VARS_NAME__)
+    return tool
+
+
+def compile_tool_schema(func: AgentFunction) -> dict:
+    """
+    Returns the tool schema for `func` as sent to the model, memoized per
+    function. The returned dict is shared and must not be mutated.
+    """
+    try:
+        tool = _tool_schemas.get(func)
+    except TypeError:  # unhashable or not weakly referenceable
+        return _compile_tool_schema(func)
+    if tool is None:
+        tool = _compile_tool_schema(func)
+        try:
+            _tool_schemas[func] = tool
+        except TypeError:
+            pass
+    return tool
+
+
+def agent_tools(agent: Agent) -> List[dict]:
+    # reuse the agent's compiled payload until its functions change
+    key = tuple(agent.functions)
+    cached = _agent_tools.get(id(agent))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    tools = [compile_tool_schema(f) for f in agent.functions]
+    if cached is None:
+        weakref.finalize(agent, _agent_tools.pop, id(agent), None)
+    _agent_tools[id(agent)] = (key, tools)
+    return tools
+
+
+def unpack_job(job) -> tuple:
+    # jobs are (agent, messages) or (agent, messages, context_variables)
+    agent, messages, *rest = job
+    context_variables = rest[0] if rest else {}
+    return agent, messages, context_variables or {}
+
+
+def tool_calls_to_objects(tool_calls: List[dict]) -> List[ChatCompletionMessageToolCall]:
+    # convert streamed tool_calls dicts to objects
+    return [
+        ChatCompletionMessageToolCall(
+            id=tool_call["id"],
+            function=Function(
+                arguments=tool_call["function"]["arguments"],
+                name=tool_call["function"]["name"],
+            ),
+            type=tool_call["type"],
+        )
+        for tool_call in tool_calls
+    ]
+
+
+class StreamedTurn:
+    """
+    One streamed completion of a run: turns its chunks into the deltas
+    yielded to the caller, and keeps the message and usage they add up to.
+    """
+
+    def __init__(self, events: RunEvents, sender: str, agent: Agent, model: str):
+        self.events = events
+        self.agent = agent
+        self.model = model
+        self.usage = None
+        self._accumulator = StreamAccumulator(sender=sender)
+        self._first_token = True
+
+    def add(self, chunk) -> Optional[dict]:
+        if self._first_token:
+            self.events.emit("on_first_token", model=self.model)
+            self._first_token = False
+        if getattr(chunk, "usage", None) is not None:
+            self.usage = chunk.usage
+        if not chunk.choices:
+            # the usage chunk of `include_usage` has no choices
+            return None
+        delta = model_to_dict(chunk.choices[0].delta)
+        if delta["role"] == "assistant":
+            delta["sender"] = self.agent.name
+        self._accumulator.add(delta)
+        return delta
+
+    def completed_tool_calls(self) -> List[ChatCompletionMessageToolCall]:
+        return tool_calls_to_objects(self._accumulator.completed_tool_calls())
+
+    def message(self) -> dict:
+        return self._accumulator.message()
+
+
 class Swarm:
-    def __init__(self, client=None):
+    # default clients share one connection pool per process
+    pooled_client = staticmethod(pooled_client)
+    session_class = Session
+
+    def __init__(
+        self,
+        client=None,
+        concurrent_tools: bool = False,
+        max_tool_workers: int = None,
+        cache: CompletionCache = None,
+        retry: RetryPolicy = None,
+        hedge: HedgePolicy = None,
+        rate_limiter: RateLimiter = None,
+        hooks: List[RunHooks] = None,
+        session_store=None,
+        checkpoint_store=None,
+    ):
         if not client:
-            client = OpenAI()
+            client = self.pooled_client()
         self.client = client
+        self.concurrent_tools = concurrent_tools
+        self.max_tool_workers = max_tool_workers
+        self.cache = cache
+        self.retry = retry
+        self.hedge = hedge
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks or [])
+        self.session_store = session_store or MemoryStore()
+        self.checkpoint_store = checkpoint_store
+        self._tool_executor = None
 
-    def get_chat_completion(
+    @classmethod
+    def pooled(cls, **pool_kwargs):
+        """
+        Returns a client using the process-wide pooled OpenAI client for
+        `pool_kwargs` (max_connections, max_keepalive_connections,
+        keepalive_expiry, http2, and any OpenAI client arguments).
+        """
+        return cls(client=cls.pooled_client(**pool_kwargs))
+
+    def pool_stats(self) -> PoolStats:
+        return pool_stats(self.client)
+
+    @property
+    def tool_executor(self) -> ThreadPoolExecutor:
+        if self._tool_executor is None:
+            self._tool_executor = ThreadPoolExecutor(
+                max_workers=self.max_tool_workers, thread_name_prefix="swarm-tool"
+            )
+        return self._tool_executor
+
+    def run_hooks(self, profile: Union[RunProfiler, str] = None) -> List[RunHooks]:
+        # the registered hooks, plus a profiler for this run only
+        if profile is None:
+            return self.hooks
+        if not isinstance(profile, RunProfiler):
+            profile = RunProfiler(profile)
+        return [*self.hooks, profile]
+
+    def session(
+        self, session_id: str, agent: Agent, store=None, agents: Iterable[Agent] = ()
+    ) -> Session:
+        """
+        Returns the conversation `session_id` from `store` (the client's
+        `session_store` by default), starting at `agent` if it is new.
+        """
+        return self.session_class(self, session_id, agent, store or self.session_store, agents)
+
+    def save_checkpoint(
+        self,
+        state: Optional[RunState],
+        history: History,
+        agent: Agent,
+        context_variables: dict,
+        turn: int,
+        pending_tool_calls: List[dict] = (),
+        done: bool = False,
+    ) -> None:
+        if state is None:
+            return
+        state.new_messages = history.new
+        state.agent = agent.name
+        state.context_variables = context_variables
+        state.pending_tool_calls = list(pending_tool_calls)
+        state.tool_context_variables = {}
+        state.tool_handoff = None
+        state.turn = turn
+        state.done = done
+        self.checkpoint_store.save(state)
+
+    def load_checkpoint(self, run_id: str, agents: Iterable[Agent]):
+        if self.checkpoint_store is None:
+            raise ValueError("Resuming a run requires a `checkpoint_store`.")
+        state = self.checkpoint_store.load(run_id)
+        if state is None:
+            raise KeyError(f"No checkpoint for run {run_id}.")
+        agents = {a.name: a for a in agents}
+        for name in filter(None, (state.agent, state.tool_handoff)):
+            if name not in agents:
+                raise ValueError(
+                    f"Run {run_id} was handed off to unknown agent {name!r}; "
+                    "pass it in `agents`."
+                )
+        history = History(state.messages)
+        history.extend(state.new_messages)
+        handoff = agents[state.tool_handoff] if state.tool_handoff else None
+        return state, agents[state.agent], handoff, history
+
+    def tool_checkpointer(self, state: Optional[RunState], history: History):
+        # saves each tool result as it arrives (in call order), so resuming
+        # executes again only the calls that had not finished
+        if state is None:
+            return None
+        messages = list(history.new)
+
+        def on_result(tool_call: ChatCompletionMessageToolCall, result: Result) -> None:
+            merged = self.merge_tool_results([tool_call], [result])
+            messages.extend(merged.messages)
+            state.new_messages = messages
+            state.pending_tool_calls = state.pending_tool_calls[1:]
+            state.tool_context_variables.update(merged.context_variables)
+            if merged.agent:
+                state.tool_handoff = merged.agent.name
+            self.checkpoint_store.save(state)
+
+        return on_result
+
+    def start_run(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict,
+        model_override: str,
+        debug: bool,
+        max_turns: int,
+        execute_tools: bool,
+        history_policy: HistoryPolicy,
+        profile: Union[RunProfiler, str],
+        run_id: str,
+    ) -> dict:
+        # the `_run_turns` arguments of a new run, checkpointed from the start
+        # share the caller's messages and copy only the top level of
+        # context_variables, instead of deep-copying both on every run
+        context_variables = dict(context_variables)
+        run_id = run_id or new_run_id()
+        state = None
+        if self.checkpoint_store is not None:
+            state = RunState(
+                run_id=run_id,
+                agent=agent.name,
+                messages=messages,
+                context_variables=context_variables,
+                model_override=model_override,
+                max_turns=None if max_turns == float("inf") else max_turns,
+                execute_tools=execute_tools,
+            )
+            self.checkpoint_store.start(state)
+        return dict(
+            run_id=run_id,
+            state=state,
+            agent=agent,
+            history=History(messages),
+            context_variables=context_variables,
+            model_override=model_override,
+            debug=debug,
+            max_turns=max_turns,
+            execute_tools=execute_tools,
+            history_policy=history_policy,
+            profile=profile,
+        )
+
+    def resume_run(
+        self,
+        run_id: str,
+        agents: Iterable[Agent],
+        debug: bool,
+        history_policy: HistoryPolicy,
+        profile: Union[RunProfiler, str],
+    ) -> Union[Response, dict]:
+        # the response of a finished run, or the `_run_turns` arguments
+        # continuing an unfinished one
+        state, agent, handoff, history = self.load_checkpoint(run_id, agents)
+        if state.done:
+            return Response(
+                messages=history.new, agent=agent, context_variables=state.context_variables
+            )
+        return dict(
+            run_id=run_id,
+            state=state,
+            agent=agent,
+            history=history,
+            context_variables=state.context_variables,
+            model_override=state.model_override,
+            debug=debug,
+            max_turns=float("inf") if state.max_turns is None else state.max_turns,
+            execute_tools=state.execute_tools,
+            history_policy=history_policy,
+            profile=profile,
+            pending_tool_calls=state.unfinished_batch(),
+            pending_handoff=handoff,
+        )
+
+    def start_events(
+        self,
+        run_id: str,
+        agent: Agent,
+        history: History,
+        context_variables: dict,
+        profile: Union[RunProfiler, str],
+        turn: int = 0,
+    ) -> RunEvents:
+        events = RunEvents(run_id, self.run_hooks(profile), agent.name)
+        events.turn = turn
+        emit_with_context(events, "on_run_start", len(history), context_variables)
+        return events
+
+    def start_turn(
+        self,
+        events: RunEvents,
+        agent: Agent,
+        history: History,
+        context_variables: dict,
+        model_override: str,
+    ) -> str:
+        # returns the model the turn's completion is requested from
+        events.turn += 1
+        events.agent = agent.name
+        emit_with_context(events, "on_turn_start", len(history), context_variables)
+        model = model_override or agent.model
+        events.emit("on_llm_request", model=model, message_count=len(history))
+        return model
+
+    def record_message(
+        self,
+        events: RunEvents,
+        run_usage: RunUsage,
+        history: History,
+        agent: Agent,
+        model: str,
+        message: dict,
+        usage,
+        debug: bool,
+    ) -> dict:
+        log(debug, logging.DEBUG, "Received completion", completion=message)
+        history.append(message)
+        run_usage.record(agent.name, Usage.from_completion(usage))
+        emit_llm_end(events, model, message["tool_calls"], usage)
+        return message
+
+    def record_completion(
+        self,
+        events: RunEvents,
+        run_usage: RunUsage,
+        history: History,
+        agent: Agent,
+        model: str,
+        completion,
+        debug: bool,
+    ) -> dict:
+        message = completion.choices[0].message
+        message.sender = agent.name
+        return self.record_message(
+            events,
+            run_usage,
+            history,
+            agent,
+            model,
+            model_to_dict(message),  # to avoid OpenAI types
+            getattr(completion, "usage", None),
+            debug,
+        )
+
+    def start_tool_batch(
+        self,
+        state: Optional[RunState],
+        history: History,
+        agent: Agent,
+        context_variables: dict,
+        turn: int,
+        tool_calls: List[dict],
+    ) -> tuple:
+        # returns the calls to execute, with the context_variables updates
+        # and handoff of results already applied (none for a new batch)
+        self.save_checkpoint(
+            state, history, agent, context_variables, turn, pending_tool_calls=tool_calls
+        )
+        return tool_calls_to_objects(tool_calls), {}, None
+
+    def resumed_tool_batch(
+        self, state: RunState, tool_calls: List[dict], handoff: Optional[Agent]
+    ) -> tuple:
+        # a resumed run first executes the calls it was interrupted before,
+        # after the results of those that had finished
+        return tool_calls_to_objects(tool_calls), dict(state.tool_context_variables), handoff
+
+    def apply_tool_results(
+        self,
+        events: RunEvents,
+        history: History,
+        context_variables: dict,
+        agent: Agent,
+        partial_response: Response,
+        tool_context_variables: dict = {},
+        handoff: Agent = None,
+    ) -> Agent:
+        # returns the agent that takes the next turn
+        history.extend(partial_response.messages)
+        context_variables.update(tool_context_variables)
+        context_variables.update(partial_response.context_variables)
+        handoff = partial_response.agent or handoff
+        if handoff:
+            emit_handoff(events, agent, handoff, history)
+            return handoff
+        return agent
+
+    def finish_run(
+        self,
+        state: Optional[RunState],
+        events: RunEvents,
+        history: History,
+        agent: Agent,
+        context_variables: dict,
+        run_usage: RunUsage,
+    ) -> Response:
+        self.save_checkpoint(state, history, agent, context_variables, events.turn, done=True)
+        events.agent = agent.name
+        events.emit("on_run_end", message_count=len(history))
+        return Response(
+            messages=history.new,
+            agent=agent,
+            context_variables=context_variables,
+            usage=run_usage,
+        )
+
+    def build_completion_params(
         self,
         agent: Agent,
         history: List,
@@ -37,23 +501,20 @@ class Swarm:
         model_override: str,
         stream: bool,
         debug: bool,
-    ) -> ChatCompletionMessage:
+        history_policy: HistoryPolicy = None,
+    ) -> dict:
         context_variables = defaultdict(str, context_variables)
         instructions = (
             agent.instructions(context_variables)
             if callable(agent.instructions)
             else agent.instructions
         )
-        messages = [{"role": "system", "content": instructions}] + history
-        debug_print(debug, "Getting chat completion for...:", messages)
+        if history_policy:
+            history = history_policy(history)
+        messages = [{"role": "system", "content": instructions}, *history]
+        log(debug, logging.DEBUG, "Getting chat completion for...", messages=messages)
 
-        tools = [function_to_json(f) for f in agent.functions]
-        # hide context_variables from model
-        for tool in tools:
-            params = tool["function"]["parameters"]
-            params["properties"].pop(__CTX_VARS_NAME__, None)
-            if __CTX_VARS_NAME__ in params["required"]:
-                params["required"].remove(__CTX_VARS_NAME__)
+        tools = agent_tools(agent)
 
         create_params = {
             "model": model_override or agent.model,
@@ -65,8 +526,61 @@ class Swarm:
 
         if tools:
             create_params["parallel_tool_calls"] = agent.parallel_tool_calls
+        if stream:
+            # the last chunk then carries the usage of the whole completion
+            create_params["stream_options"] = {"include_usage": True}
+
+        return create_params
+
+    def create_completion(self, create_params: dict):
+        create = functools.partial(self.client.chat.completions.create, **create_params)
+        if self.rate_limiter:
+            # every attempt, including retries and hedges, counts against the quota
+            tokens = self.rate_limiter.estimate(create_params)
+            unlimited_create = create
 
-        return self.client.chat.completions.create(**create_params)
+            def create():
+                self.rate_limiter.acquire(tokens)
+                return unlimited_create()
+
+        if self.hedge:
+            create = functools.partial(self.hedge.call, create)
+        if self.retry:
+            return self.retry.call(create)
+        return create()
+
+    def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+        history_policy: HistoryPolicy = None,
+    ) -> ChatCompletionMessage:
+        create_params = self.build_completion_params(
+            agent,
+            history,
+            context_variables,
+            model_override,
+            stream,
+            debug,
+            history_policy=history_policy,
+        )
+        if self.cache is None:
+            return self.create_completion(create_params)
+
+        key = request_key(create_params)
+        entry = self.cache.get(key)
+        if entry is not None:
+            log(debug, logging.DEBUG, "Using cached completion.")
+            return self.cache.replay(entry, stream)
+        completion = self.create_completion(create_params)
+        if stream:
+            return self.cache.record(key, completion)
+        self.cache.store(key, completion)
+        return completion
 
     def handle_function_result(self, result, debug) -> Result:
         match result:
@@ -83,50 +597,68 @@ class Swarm:
                     return Result(value=str(result))
                 except Exception as e:
                     error_message = f"Failed to cast response to string: {result}. Make sure agent functions return a string or Result object. Error: {str(e)}"
-                    debug_print(debug, error_message)
+                    log(debug, logging.ERROR, error_message)
                     raise TypeError(error_message)
 
-    def handle_tool_calls(
+    def build_tool_args(
         self,
-        tool_calls: List[ChatCompletionMessageToolCall],
-        functions: List[AgentFunction],
+        tool_call: ChatCompletionMessageToolCall,
+        func: AgentFunction,
+        context_variables: dict,
+        debug: bool,
+    ) -> dict:
+        args = json.loads(tool_call.function.arguments)
+        log(debug, logging.DEBUG, "Processing tool call", tool=tool_call.function.name, arguments=args)
+
+        # pass context_variables to agent functions
+        if __CTX_VARS_NAME__ in func.__code__.co_varnames:
+            args[__CTX_VARS_NAME__] = context_variables
+        return args
+
+    def execute_tool_call(
+        self,
+        tool_call: ChatCompletionMessageToolCall,
+        function_map: dict,
         context_variables: dict,
         debug: bool,
+        events: RunEvents = NO_EVENTS,
+    ) -> Result:
+        name = tool_call.function.name
+        # handle missing tool case, return error to the model
+        if name not in function_map:
+            log(debug, logging.WARNING, "Tool not found in function map.", tool=name)
+            return Result(value=f"Error: Tool {name} not found.")
+
+        func = function_map[name]
+        args = self.build_tool_args(tool_call, func, context_variables, debug)
+        emit_tool_start(events, tool_call)
+        try:
+            raw_result = func(**args)
+            # coroutine agent functions run on the shared background loop
+            if inspect.isawaitable(raw_result):
+                raw_result = run_coroutine_sync(raw_result)
+            result = self.handle_function_result(raw_result, debug)
+        except Exception as e:
+            emit_tool_end(events, tool_call, error=e)
+            raise
+        emit_tool_end(events, tool_call, result=result)
+        return result
+
+    def merge_tool_results(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        results: List[Result],
     ) -> Response:
-        function_map = {f.__name__: f for f in functions}
+        # merge in tool_call order, so concurrent execution is deterministic
         partial_response = Response(
             messages=[], agent=None, context_variables={})
 
-        for tool_call in tool_calls:
-            name = tool_call.function.name
-            # handle missing tool case, skip to next tool
-            if name not in function_map:
-                debug_print(debug, f"Tool {name} not found in function map.")
-                partial_response.messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "tool_name": name,
-                        "content": f"Error: Tool {name} not found.",
-                    }
-                )
-                continue
-            args = json.loads(tool_call.function.arguments)
-            debug_print(
-                debug, f"Processing tool call: {name} with arguments {args}")
-
-            func = function_map[name]
-            # pass context_variables to agent functions
-            if __CTX_VARS_NAME__ in func.__code__.co_varnames:
-                args[__CTX_VARS_NAME__] = context_variables
-            raw_result = function_map[name](**args)
-
-            result: Result = self.handle_function_result(raw_result, debug)
+        for tool_call, result in zip(tool_calls, results):
             partial_response.messages.append(
                 {
                     "role": "tool",
                     "tool_call_id": tool_call.id,
-                    "tool_name": name,
+                    "tool_name": tool_call.function.name,
                     "content": result.value,
                 }
             )
@@ -136,6 +668,46 @@ class Swarm:
 
         return partial_response
 
+    def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: List[AgentFunction],
+        context_variables: dict,
+        debug: bool,
+        events: RunEvents = NO_EVENTS,
+        on_result: Callable[[ChatCompletionMessageToolCall, Result], None] = None,
+    ) -> Response:
+        function_map = {f.__name__: f for f in functions}
+
+        if self.concurrent_tools and len(tool_calls) > 1:
+            futures = [
+                self.tool_executor.submit(
+                    self.execute_tool_call,
+                    tool_call,
+                    function_map,
+                    context_variables,
+                    debug,
+                    events,
+                )
+                for tool_call in tool_calls
+            ]
+            results = []
+            for tool_call, future in zip(tool_calls, futures):
+                results.append(future.result())
+                if on_result:
+                    on_result(tool_call, results[-1])
+        else:
+            results = []
+            for tool_call in tool_calls:
+                results.append(
+                    self.execute_tool_call(
+                        tool_call, function_map, context_variables, debug, events)
+                )
+                if on_result:
+                    on_result(tool_call, results[-1])
+
+        return self.merge_tool_results(tool_calls, results)
+
     def run_and_stream(
         self,
         agent: Agent,
@@ -145,90 +717,543 @@ class Swarm:
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        speculative_tools: bool = False,
+        history_policy: HistoryPolicy = None,
+        profile: Union[RunProfiler, str] = None,
     ):
         active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
-
-        while len(history) - init_len < max_turns:
-
-            message = {
-                "content": "",
-                "sender": agent.name,
-                "role": "assistant",
-                "function_call": None,
-                "tool_calls": defaultdict(
-                    lambda: {
-                        "function": {"arguments": "", "name": ""},
-                        "id": "",
-                        "type": "",
-                    }
-                ),
-            }
-
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
+        # share the caller's messages and copy only the top level of
+        # context_variables, instead of deep-copying both on every run
+        context_variables = dict(context_variables)
+        history = History(messages)
+        run_usage = RunUsage()
+        events = self.start_events(new_run_id(), agent, history, context_variables, profile)
+
+        try:
+            while len(history.new) < max_turns:
+                model = self.start_turn(
+                    events, active_agent, history, context_variables, model_override
+                )
+
+                # get completion with current history, agent
+                completion = self.get_chat_completion(
+                    agent=active_agent,
+                    history=history,
+                    context_variables=context_variables,
+                    model_override=model_override,
+                    stream=True,
+                    debug=debug,
+                    history_policy=history_policy,
+                )
+
+                turn = StreamedTurn(events, agent.name, active_agent, model)
+                function_map = {f.__name__: f for f in active_agent.functions}
+                speculative = {}
+
+                yield {"delim": "start"}
+                for chunk in completion:
+                    delta = turn.add(chunk)
+                    if delta is None:
+                        continue
+                    yield delta
+                    if speculative_tools and execute_tools:
+                        # start tools whose arguments are complete while the rest streams
+                        for tool_call in turn.completed_tool_calls():
+                            speculative[tool_call.id] = self.tool_executor.submit(
+                                self.execute_tool_call,
+                                tool_call,
+                                function_map,
+                                context_variables,
+                                debug,
+                                events,
+                            )
+                yield {"delim": "end"}
+
+                message = self.record_message(
+                    events,
+                    run_usage,
+                    history,
+                    active_agent,
+                    model,
+                    turn.message(),
+                    turn.usage,
+                    debug,
+                )
+                if not message["tool_calls"] or not execute_tools:
+                    log(debug, logging.DEBUG, "Ending turn.")
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                tool_calls = tool_calls_to_objects(message["tool_calls"])
+                if speculative:
+                    results = [
+                        speculative[tool_call.id].result()
+                        if tool_call.id in speculative
+                        else self.execute_tool_call(
+                            tool_call, function_map, context_variables, debug, events
+                        )
+                        for tool_call in tool_calls
+                    ]
+                    partial_response = self.merge_tool_results(tool_calls, results)
+                else:
+                    partial_response = self.handle_tool_calls(
+                        tool_calls, active_agent.functions, context_variables, debug, events
+                    )
+                active_agent = self.apply_tool_results(
+                    events, history, context_variables, active_agent, partial_response
+                )
+        except GeneratorExit:
+            # the consumer stopped iterating before the run finished
+            events.emit("on_run_end", message_count=len(history), data={"closed": True})
+            raise
+        except BaseException as e:
+            events.emit("on_run_end", message_count=len(history), data={"error": e})
+            raise
+
+        response = self.finish_run(None, events, history, active_agent, context_variables, run_usage)
+        yield {"usage": run_usage}
+        yield {"response": response}
+
+    def run(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        stream: bool = False,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        speculative_tools: bool = False,
+        history_policy: HistoryPolicy = None,
+        profile: Union[RunProfiler, str] = None,
+        run_id: str = None,
+    ) -> Response:
+        if stream:
+            return self.run_and_stream(
+                agent=agent,
+                messages=messages,
                 context_variables=context_variables,
                 model_override=model_override,
-                stream=True,
                 debug=debug,
+                max_turns=max_turns,
+                execute_tools=execute_tools,
+                speculative_tools=speculative_tools,
+                history_policy=history_policy,
+                profile=profile,
             )
+        return self._run_turns(
+            **self.start_run(
+                agent,
+                messages,
+                context_variables,
+                model_override,
+                debug,
+                max_turns,
+                execute_tools,
+                history_policy,
+                profile,
+                run_id,
+            )
+        )
 
-            yield {"delim": "start"}
-            for chunk in completion:
-                delta = json.loads(chunk.choices[0].delta.json())
-                if delta["role"] == "assistant":
-                    delta["sender"] = active_agent.name
-                yield delta
-                delta.pop("role", None)
-                delta.pop("sender", None)
-                merge_chunk(message, delta)
-            yield {"delim": "end"}
-
-            message["tool_calls"] = list(
-                message.get("tool_calls", {}).values())
-            if not message["tool_calls"]:
-                message["tool_calls"] = None
-            debug_print(debug, "Received completion:", message)
-            history.append(message)
-
-            if not message["tool_calls"] or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # convert tool_calls to objects
-            tool_calls = []
-            for tool_call in message["tool_calls"]:
-                function = Function(
-                    arguments=tool_call["function"]["arguments"],
-                    name=tool_call["function"]["name"],
+    def _run_turns(
+        self,
+        run_id: str,
+        state: Optional[RunState],
+        agent: Agent,
+        history: History,
+        context_variables: dict,
+        model_override: str,
+        debug: bool,
+        max_turns: int,
+        execute_tools: bool,
+        history_policy: HistoryPolicy,
+        profile: Union[RunProfiler, str],
+        pending_tool_calls: List[dict] = None,
+        pending_handoff: Agent = None,
+    ) -> Response:
+        active_agent = agent
+        run_usage = RunUsage()
+        events = self.start_events(
+            run_id, agent, history, context_variables, profile, state.turn if state else 0
+        )
+
+        try:
+            while pending_tool_calls is not None or (
+                len(history.new) < max_turns and active_agent
+            ):
+                if pending_tool_calls is not None:
+                    batch = self.resumed_tool_batch(state, pending_tool_calls, pending_handoff)
+                    pending_tool_calls = None
+                else:
+                    model = self.start_turn(
+                        events, active_agent, history, context_variables, model_override
+                    )
+
+                    # get completion with current history, agent
+                    completion = self.get_chat_completion(
+                        agent=active_agent,
+                        history=history,
+                        context_variables=context_variables,
+                        model_override=model_override,
+                        stream=False,
+                        debug=debug,
+                        history_policy=history_policy,
+                    )
+                    message = self.record_completion(
+                        events, run_usage, history, active_agent, model, completion, debug
+                    )
+                    if not message["tool_calls"] or not execute_tools:
+                        log(debug, logging.DEBUG, "Ending turn.")
+                        break
+                    batch = self.start_tool_batch(
+                        state,
+                        history,
+                        active_agent,
+                        context_variables,
+                        events.turn,
+                        message["tool_calls"],
+                    )
+
+                # handle function calls, updating context_variables, and switching agents
+                tool_calls, tool_context_variables, handoff = batch
+                partial_response = self.handle_tool_calls(
+                    tool_calls,
+                    active_agent.functions,
+                    context_variables,
+                    debug,
+                    events,
+                    on_result=self.tool_checkpointer(state, history),
                 )
-                tool_call_object = ChatCompletionMessageToolCall(
-                    id=tool_call["id"], function=function, type=tool_call["type"]
+                active_agent = self.apply_tool_results(
+                    events,
+                    history,
+                    context_variables,
+                    active_agent,
+                    partial_response,
+                    tool_context_variables,
+                    handoff,
                 )
-                tool_calls.append(tool_call_object)
+                self.save_checkpoint(state, history, active_agent, context_variables, events.turn)
+        except BaseException as e:
+            events.emit("on_run_end", message_count=len(history), data={"error": e})
+            raise
 
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                tool_calls, active_agent.functions, context_variables, debug
-            )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
-
-        yield {
-            "response": Response(
-                messages=history[init_len:],
-                agent=active_agent,
+        return self.finish_run(state, events, history, active_agent, context_variables, run_usage)
+
+    def resume(
+        self,
+        run_id: str,
+        agents: Iterable[Agent],
+        debug: bool = False,
+        history_policy: HistoryPolicy = None,
+        profile: Union[RunProfiler, str] = None,
+    ) -> Response:
+        """
+        Continues a checkpointed run from its last checkpoint, without
+        repeating the completions and tool calls it had already finished.
+        `agents` must include the run's active agent, which is looked up by
+        name. `Response.messages` holds every message the run has added.
+        """
+        turns = self.resume_run(run_id, agents, debug, history_policy, profile)
+        if isinstance(turns, Response):
+            return turns
+        return self._run_turns(**turns)
+
+    def run_many(
+        self,
+        jobs: Iterable,
+        max_concurrency: int = 8,
+        model_override: str = None,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        history_policy: HistoryPolicy = None,
+    ) -> Iterator[BatchResult]:
+        """
+        Runs many independent conversations with at most `max_concurrency`
+        in flight, yielding a `BatchResult` for each job as soon as it
+        finishes. A failing job is reported through `BatchResult.error`
+        and does not abort the batch.
+        """
+        jobs = enumerate(jobs)
+
+        def run_job(job):
+            agent, messages, context_variables = unpack_job(job)
+            return self.run(
+                agent=agent,
+                messages=messages,
                 context_variables=context_variables,
+                model_override=model_override,
+                debug=debug,
+                max_turns=max_turns,
+                execute_tools=execute_tools,
+                history_policy=history_policy,
             )
-        }
 
-    def run(
+        with ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="swarm-run"
+        ) as executor:
+            pending = {}
+
+            def submit_next():
+                # jobs are pulled lazily so large iterables are never materialized
+                for index, job in jobs:
+                    pending[executor.submit(run_job, job)] = index
+                    return
+
+            for _ in range(max_concurrency):
+                submit_next()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    submit_next()
+                    error = future.exception()
+                    yield BatchResult(
+                        index=index,
+                        response=None if error else future.result(),
+                        error=error,
+                    )
+
+
+class AsyncSwarm(Swarm):
+    pooled_client = staticmethod(pooled_async_client)
+    session_class = AsyncSession
+
+    async def create_completion(self, create_params: dict):
+        create = functools.partial(self.client.chat.completions.create, **create_params)
+        if self.rate_limiter:
+            # every attempt, including retries and hedges, counts against the quota
+            tokens = self.rate_limiter.estimate(create_params)
+            unlimited_create = create
+
+            async def create():
+                await self.rate_limiter.aacquire(tokens)
+                return await unlimited_create()
+
+        if self.hedge:
+            create = functools.partial(self.hedge.acall, create)
+        if self.retry:
+            return await self.retry.acall(create)
+        return await create()
+
+    async def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+        history_policy: HistoryPolicy = None,
+    ) -> ChatCompletionMessage:
+        create_params = self.build_completion_params(
+            agent,
+            history,
+            context_variables,
+            model_override,
+            stream,
+            debug,
+            history_policy=history_policy,
+        )
+        if self.cache is None:
+            return await self.create_completion(create_params)
+
+        key = request_key(create_params)
+        entry = self.cache.get(key)
+        if entry is not None:
+            log(debug, logging.DEBUG, "Using cached completion.")
+            return await self.cache.areplay(entry, stream)
+        completion = await self.create_completion(create_params)
+        if stream:
+            return self.cache.arecord(key, completion)
+        self.cache.store(key, completion)
+        return completion
+
+    async def execute_tool_call(
+        self,
+        tool_call: ChatCompletionMessageToolCall,
+        function_map: dict,
+        context_variables: dict,
+        debug: bool,
+        events: RunEvents = NO_EVENTS,
+    ) -> Result:
+        name = tool_call.function.name
+        # handle missing tool case, return error to the model
+        if name not in function_map:
+            log(debug, logging.WARNING, "Tool not found in function map.", tool=name)
+            return Result(value=f"Error: Tool {name} not found.")
+
+        func = function_map[name]
+        args = self.build_tool_args(tool_call, func, context_variables, debug)
+        emit_tool_start(events, tool_call)
+        try:
+            if self.concurrent_tools and not inspect.iscoroutinefunction(func):
+                # keep blocking agent functions off the event loop
+                raw_result = await asyncio.get_running_loop().run_in_executor(
+                    self.tool_executor, functools.partial(func, **args)
+                )
+            else:
+                raw_result = func(**args)
+            if inspect.isawaitable(raw_result):
+                raw_result = await raw_result
+            result = self.handle_function_result(raw_result, debug)
+        except Exception as e:
+            emit_tool_end(events, tool_call, error=e)
+            raise
+        emit_tool_end(events, tool_call, result=result)
+        return result
+
+    async def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: List[AgentFunction],
+        context_variables: dict,
+        debug: bool,
+        events: RunEvents = NO_EVENTS,
+        on_result: Callable[[ChatCompletionMessageToolCall, Result], None] = None,
+    ) -> Response:
+        function_map = {f.__name__: f for f in functions}
+
+        if self.concurrent_tools and len(tool_calls) > 1:
+            tasks = [
+                asyncio.ensure_future(
+                    self.execute_tool_call(
+                        tool_call, function_map, context_variables, debug, events)
+                )
+                for tool_call in tool_calls
+            ]
+            if not on_result:
+                results = await asyncio.gather(*tasks)
+            else:
+                results = []
+                try:
+                    for tool_call, task in zip(tool_calls, tasks):
+                        results.append(await task)
+                        on_result(tool_call, results[-1])
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    raise
+        else:
+            results = []
+            for tool_call in tool_calls:
+                results.append(
+                    await self.execute_tool_call(
+                        tool_call, function_map, context_variables, debug, events)
+                )
+                if on_result:
+                    on_result(tool_call, results[-1])
+
+        return self.merge_tool_results(tool_calls, results)
+
+    async def run_and_stream(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        speculative_tools: bool = False,
+        history_policy: HistoryPolicy = None,
+        profile: Union[RunProfiler, str] = None,
+    ):
+        active_agent = agent
+        # share the caller's messages and copy only the top level of
+        # context_variables, instead of deep-copying both on every run
+        context_variables = dict(context_variables)
+        history = History(messages)
+        run_usage = RunUsage()
+        events = self.start_events(new_run_id(), agent, history, context_variables, profile)
+
+        try:
+            while len(history.new) < max_turns:
+                model = self.start_turn(
+                    events, active_agent, history, context_variables, model_override
+                )
+
+                # get completion with current history, agent
+                completion = await self.get_chat_completion(
+                    agent=active_agent,
+                    history=history,
+                    context_variables=context_variables,
+                    model_override=model_override,
+                    stream=True,
+                    debug=debug,
+                    history_policy=history_policy,
+                )
+
+                turn = StreamedTurn(events, agent.name, active_agent, model)
+                function_map = {f.__name__: f for f in active_agent.functions}
+                speculative = {}
+
+                yield {"delim": "start"}
+                async for chunk in completion:
+                    delta = turn.add(chunk)
+                    if delta is None:
+                        continue
+                    yield delta
+                    if speculative_tools and execute_tools:
+                        # start tools whose arguments are complete while the rest streams
+                        for tool_call in turn.completed_tool_calls():
+                            speculative[tool_call.id] = asyncio.ensure_future(
+                                self.execute_tool_call(
+                                    tool_call, function_map, context_variables, debug, events
+                                )
+                            )
+                yield {"delim": "end"}
+
+                message = self.record_message(
+                    events,
+                    run_usage,
+                    history,
+                    active_agent,
+                    model,
+                    turn.message(),
+                    turn.usage,
+                    debug,
+                )
+                if not message["tool_calls"] or not execute_tools:
+                    log(debug, logging.DEBUG, "Ending turn.")
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                tool_calls = tool_calls_to_objects(message["tool_calls"])
+                if speculative:
+                    results = [
+                        await speculative[tool_call.id]
+                        if tool_call.id in speculative
+                        else await self.execute_tool_call(
+                            tool_call, function_map, context_variables, debug, events
+                        )
+                        for tool_call in tool_calls
+                    ]
+                    partial_response = self.merge_tool_results(tool_calls, results)
+                else:
+                    partial_response = await self.handle_tool_calls(
+                        tool_calls, active_agent.functions, context_variables, debug, events
+                    )
+                active_agent = self.apply_tool_results(
+                    events, history, context_variables, active_agent, partial_response
+                )
+        except GeneratorExit:
+            # the consumer stopped iterating before the run finished
+            events.emit("on_run_end", message_count=len(history), data={"closed": True})
+            raise
+        except BaseException as e:
+            events.emit("on_run_end", message_count=len(history), data={"error": e})
+            raise
+
+        response = self.finish_run(None, events, history, active_agent, context_variables, run_usage)
+        yield {"usage": run_usage}
+        yield {"response": response}
+
+    async def run(
         self,
         agent: Agent,
         messages: List,
@@ -238,6 +1263,10 @@ class Swarm:
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        speculative_tools: bool = False,
+        history_policy: HistoryPolicy = None,
+        profile: Union[RunProfiler, str] = None,
+        run_id: str = None,
     ) -> Response:
         if stream:
             return self.run_and_stream(
@@ -248,45 +1277,176 @@ class Swarm:
                 debug=debug,
                 max_turns=max_turns,
                 execute_tools=execute_tools,
+                speculative_tools=speculative_tools,
+                history_policy=history_policy,
+                profile=profile,
+            )
+        return await self._run_turns(
+            **self.start_run(
+                agent,
+                messages,
+                context_variables,
+                model_override,
+                debug,
+                max_turns,
+                execute_tools,
+                history_policy,
+                profile,
+                run_id,
             )
+        )
+
+    async def _run_turns(
+        self,
+        run_id: str,
+        state: Optional[RunState],
+        agent: Agent,
+        history: History,
+        context_variables: dict,
+        model_override: str,
+        debug: bool,
+        max_turns: int,
+        execute_tools: bool,
+        history_policy: HistoryPolicy,
+        profile: Union[RunProfiler, str],
+        pending_tool_calls: List[dict] = None,
+        pending_handoff: Agent = None,
+    ) -> Response:
         active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
+        run_usage = RunUsage()
+        events = self.start_events(
+            run_id, agent, history, context_variables, profile, state.turn if state else 0
+        )
+
+        try:
+            while pending_tool_calls is not None or (
+                len(history.new) < max_turns and active_agent
+            ):
+                if pending_tool_calls is not None:
+                    batch = self.resumed_tool_batch(state, pending_tool_calls, pending_handoff)
+                    pending_tool_calls = None
+                else:
+                    model = self.start_turn(
+                        events, active_agent, history, context_variables, model_override
+                    )
+
+                    # get completion with current history, agent
+                    completion = await self.get_chat_completion(
+                        agent=active_agent,
+                        history=history,
+                        context_variables=context_variables,
+                        model_override=model_override,
+                        stream=False,
+                        debug=debug,
+                        history_policy=history_policy,
+                    )
+                    message = self.record_completion(
+                        events, run_usage, history, active_agent, model, completion, debug
+                    )
+                    if not message["tool_calls"] or not execute_tools:
+                        log(debug, logging.DEBUG, "Ending turn.")
+                        break
+                    batch = self.start_tool_batch(
+                        state,
+                        history,
+                        active_agent,
+                        context_variables,
+                        events.turn,
+                        message["tool_calls"],
+                    )
 
-        while len(history) - init_len < max_turns and active_agent:
+                # handle function calls, updating context_variables, and switching agents
+                tool_calls, tool_context_variables, handoff = batch
+                partial_response = await self.handle_tool_calls(
+                    tool_calls,
+                    active_agent.functions,
+                    context_variables,
+                    debug,
+                    events,
+                    on_result=self.tool_checkpointer(state, history),
+                )
+                active_agent = self.apply_tool_results(
+                    events,
+                    history,
+                    context_variables,
+                    active_agent,
+                    partial_response,
+                    tool_context_variables,
+                    handoff,
+                )
+                self.save_checkpoint(state, history, active_agent, context_variables, events.turn)
+        except BaseException as e:
+            events.emit("on_run_end", message_count=len(history), data={"error": e})
+            raise
 
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
+        return self.finish_run(state, events, history, active_agent, context_variables, run_usage)
+
+    async def resume(
+        self,
+        run_id: str,
+        agents: Iterable[Agent],
+        debug: bool = False,
+        history_policy: HistoryPolicy = None,
+        profile: Union[RunProfiler, str] = None,
+    ) -> Response:
+        """
+        Continues a checkpointed run from its last checkpoint, without
+        repeating the completions and tool calls it had already finished.
+        `agents` must include the run's active agent, which is looked up by
+        name. `Response.messages` holds every message the run has added.
+        """
+        turns = self.resume_run(run_id, agents, debug, history_policy, profile)
+        if isinstance(turns, Response):
+            return turns
+        return await self._run_turns(**turns)
+
+    async def run_many(
+        self,
+        jobs: Iterable,
+        max_concurrency: int = 8,
+        model_override: str = None,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        history_policy: HistoryPolicy = None,
+    ) -> AsyncIterator[BatchResult]:
+        jobs = enumerate(jobs)
+
+        async def run_job(job):
+            agent, messages, context_variables = unpack_job(job)
+            return await self.run(
+                agent=agent,
+                messages=messages,
                 context_variables=context_variables,
                 model_override=model_override,
-                stream=stream,
                 debug=debug,
+                max_turns=max_turns,
+                execute_tools=execute_tools,
+                history_policy=history_policy,
             )
-            message = completion.choices[0].message
-            debug_print(debug, "Received completion:", message)
-            message.sender = active_agent.name
-            history.append(
-                json.loads(message.model_dump_json())
-            )  # to avoid OpenAI types (?)
-
-            if not message.tool_calls or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                message.tool_calls, active_agent.functions, context_variables, debug
-            )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
 
-        return Response(
-            messages=history[init_len:],
-            agent=active_agent,
-            context_variables=context_variables,
-        )
+        pending = {}
+
+        def submit_next():
+            for index, job in jobs:
+                pending[asyncio.ensure_future(run_job(job))] = index
+                return
+
+        for _ in range(max_concurrency):
+            submit_next()
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = pending.pop(task)
+                    submit_next()
+                    error = task.exception()
+                    yield BatchResult(
+                        index=index,
+                        response=None if error else task.result(),
+                        error=error,
+                    )
+        finally:
+            for task in pending:
+                task.cancel()
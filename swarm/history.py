@@ -0,0 +1,131 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from itertools import chain, islice
+from typing import Callable, List
+
+
+class History(Sequence):
+    """
+    The conversation history of a single run.
+
+    The caller's messages are shared rather than copied, and only the
+    messages produced during the run are stored, so starting a run costs
+    the same regardless of how long the conversation already is. Messages
+    are never mutated once appended.
+
+    Attributes:
+        base (List): The caller's messages, as passed into the run.
+        new (List): The messages produced during the run.
+    """
+
+    def __init__(self, messages: List):
+        self.base = messages
+        self.base_len = len(messages)
+        self.new = []
+
+    def __len__(self) -> int:
+        return self.base_len + len(self.new)
+
+    def __iter__(self):
+        return chain(islice(self.base, self.base_len), self.new)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("history index out of range")
+        if index < self.base_len:
+            return self.base[index]
+        return self.new[index - self.base_len]
+
+    def __radd__(self, other: List) -> List:
+        return list(other) + list(self)
+
+    def append(self, message: dict) -> None:
+        self.new.append(message)
+
+    def extend(self, messages: List) -> None:
+        self.new.extend(messages)
+
+
+def estimate_tokens(message: dict) -> int:
+    """
+    Roughly estimates the prompt tokens used by a message, at about four
+    characters per token plus a small per-message overhead. Works offline
+    and without a tokenizer; pass a real tokenizer to `TokenBudget` when
+    exact counts matter.
+    """
+    chars = len(message.get("content") or "")
+    for tool_call in message.get("tool_calls") or []:
+        function = tool_call.get("function") or {}
+        chars += len(function.get("name") or "") + len(function.get("arguments") or "")
+    return chars // 4 + 4
+
+
+def _pair_safe_start(messages: Sequence, start: int) -> int:
+    # never open the window on tool results whose tool call was dropped:
+    # skip them, or pull in the calling message if nothing else would remain
+    aligned = start
+    while aligned < len(messages) and messages[aligned].get("role") == "tool":
+        aligned += 1
+    if aligned < len(messages):
+        return aligned
+    while start > 0 and messages[start].get("role") == "tool":
+        start -= 1
+    return start
+
+
+class HistoryPolicy(ABC):
+    """
+    Selects the part of the conversation history sent to the model on each
+    turn. Any callable taking the history and returning a list of messages
+    can be passed as `history_policy`; subclass this for the common case.
+    """
+
+    @abstractmethod
+    def __call__(self, history: Sequence) -> List:
+        ...
+
+
+class LastNTurns(HistoryPolicy):
+    """
+    Keeps the last `n` turns, where a turn starts at a user message and
+    includes every assistant and tool message that follows it.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def __call__(self, history: Sequence) -> List:
+        start, turns = len(history), 0
+        for index in range(len(history) - 1, -1, -1):
+            if history[index].get("role") == "user":
+                start, turns = index, turns + 1
+                if turns == self.n:
+                    break
+        if turns == 0:
+            start = 0
+        return [history[i] for i in range(_pair_safe_start(history, start), len(history))]
+
+
+class TokenBudget(HistoryPolicy):
+    """
+    Keeps the most recent messages that fit in `max_tokens`, as measured by
+    `estimator`. The newest message is always kept, and tool results are
+    never separated from the message that called them.
+    """
+
+    def __init__(self, max_tokens: int, estimator: Callable[[dict], int] = estimate_tokens):
+        self.max_tokens = max_tokens
+        self.estimator = estimator
+
+    def __call__(self, history: Sequence) -> List:
+        start, used = len(history), 0
+        for index in range(len(history) - 1, -1, -1):
+            used += self.estimator(history[index])
+            if used > self.max_tokens and start < len(history):
+                break
+            start = index
+        return [history[i] for i in range(_pair_safe_start(history, start), len(history))]
@@ -0,0 +1,171 @@
+import time
+import uuid
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class HookEvent(BaseModel):
+    """
+    A lifecycle event of a run, passed to every registered `RunHooks`.
+
+    Attributes:
+        name (str): The hook being called, e.g. "on_tool_end".
+        run_id (str): Identifies the run; shared by all of its events.
+        timestamp (float): `time.monotonic()` when the event happened.
+        agent (str): The name of the active agent.
+        turn (int): The number of completions requested so far in the run.
+        message_count (int): The number of messages in the history.
+        model (str): The model of the completion (LLM events).
+        tool (str): The function name (tool events).
+        tool_call_id (str): The id of the tool call (tool events).
+        data (dict): Any other event-specific details, such as the handoff
+            target, argument sizes, token usage or the error raised.
+            `on_run_end` has `closed` set when a stream was closed early.
+    """
+
+    name: str
+    run_id: str
+    timestamp: float
+    agent: Optional[str] = None
+    turn: int = 0
+    message_count: int = 0
+    model: Optional[str] = None
+    tool: Optional[str] = None
+    tool_call_id: Optional[str] = None
+    data: dict = {}
+
+
+class RunHooks:
+    """
+    Receives lifecycle events from `Swarm` runs. Subclass it and override
+    the events you need; pass instances to `Swarm(hooks=[...])`.
+
+    Events are delivered synchronously on the thread (or event loop) doing
+    the work, so hooks should be quick. Tool events of concurrent tool calls
+    may arrive from several threads at once.
+    """
+
+    def on_run_start(self, event: HookEvent) -> None:
+        pass
+
+    def on_turn_start(self, event: HookEvent) -> None:
+        pass
+
+    def on_llm_request(self, event: HookEvent) -> None:
+        pass
+
+    def on_first_token(self, event: HookEvent) -> None:
+        """Called when the first chunk of a streamed completion arrives."""
+        pass
+
+    def on_llm_end(self, event: HookEvent) -> None:
+        pass
+
+    def on_tool_start(self, event: HookEvent) -> None:
+        pass
+
+    def on_tool_end(self, event: HookEvent) -> None:
+        pass
+
+    def on_handoff(self, event: HookEvent) -> None:
+        pass
+
+    def on_run_end(self, event: HookEvent) -> None:
+        pass
+
+
+class RunEvents:
+    """
+    Dispatches the events of one run to its hooks. With no hooks, `emit`
+    returns immediately without building an event.
+    """
+
+    __slots__ = ("run_id", "hooks", "agent", "turn")
+
+    def __init__(self, run_id: str, hooks: List[RunHooks], agent: str = None):
+        self.run_id = run_id
+        self.hooks = hooks
+        self.agent = agent
+        self.turn = 0
+
+    def emit(self, name: str, **fields) -> None:
+        if not self.hooks:
+            return
+        fields.setdefault("agent", self.agent)
+        event = HookEvent(
+            name=name,
+            run_id=self.run_id,
+            timestamp=time.monotonic(),
+            turn=self.turn,
+            **fields,
+        )
+        for hook in self.hooks:
+            getattr(hook, name)(event)
+
+
+NO_EVENTS = RunEvents(run_id="", hooks=[])
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex
+
+
+# helpers for events whose details cost something to gather; they return
+# before touching the details when the run has no hooks
+
+
+def emit_with_context(
+    events: RunEvents, name: str, message_count: int, context_variables: dict
+) -> None:
+    # run and turn starts carry the context_variables keys in effect
+    if events.hooks:
+        events.emit(
+            name,
+            message_count=message_count,
+            data={"context_variables": list(context_variables)},
+        )
+
+
+def emit_llm_end(events: RunEvents, model: str, tool_calls, usage=None) -> None:
+    if events.hooks:
+        events.emit(
+            "on_llm_end",
+            model=model,
+            data={"tool_calls": len(tool_calls or []), "usage": usage},
+        )
+
+
+def emit_tool_start(events: RunEvents, tool_call) -> None:
+    if events.hooks:
+        events.emit(
+            "on_tool_start",
+            tool=tool_call.function.name,
+            tool_call_id=tool_call.id,
+            data={"arguments_size": len(tool_call.function.arguments or "")},
+        )
+
+
+def emit_tool_end(events: RunEvents, tool_call, result=None, error=None) -> None:
+    if events.hooks:
+        data = {"error": error} if error is not None else {
+            "result_size": len(result.value),
+            "handoff": result.agent.name if result.agent else None,
+            "context_variables": list(result.context_variables),
+        }
+        events.emit(
+            "on_tool_end",
+            tool=tool_call.function.name,
+            tool_call_id=tool_call.id,
+            data=data,
+        )
+
+
+def emit_handoff(events: RunEvents, from_agent, to_agent, history) -> None:
+    if events.hooks:
+        events.emit(
+            "on_handoff",
+            agent=from_agent.name,
+            message_count=len(history),
+            data={"to": to_agent.name},
+        )
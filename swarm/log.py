@@ -0,0 +1,162 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+from .util import debug_print
+
+logger = logging.getLogger("swarm")
+# like any library, stay silent unless the application configures logging
+logger.addHandler(logging.NullHandler())
+
+# longest rendering of a single field, in characters
+MAX_PAYLOAD_CHARS = 2000
+# items of a long list rendered, counting from the end
+MAX_PAYLOAD_ITEMS = 5
+
+
+def _snapshot(value, depth: int = 3):
+    # copy plain containers, so changes made after logging (or on another
+    # thread while the record is rendered) do not reach the record
+    if depth and isinstance(value, dict):
+        return {key: _snapshot(item, depth - 1) for key, item in value.items()}
+    if depth and isinstance(value, (list, tuple)):
+        return [_snapshot(item, depth - 1) for item in value]
+    return value
+
+
+class Payload:
+    """
+    A log field rendered only when a record is actually emitted, cut to
+    `MAX_PAYLOAD_CHARS`. Plain containers (dicts and lists) are copied when
+    the record is created, keeping only the last `MAX_PAYLOAD_ITEMS` items of
+    a long sequence; their rendering to text is deferred. Callables are
+    called at rendering time, so expensive values can be passed as
+    `lambda: ...`.
+    """
+
+    __slots__ = ("value", "skipped")
+
+    def __init__(self, value):
+        self.skipped = None
+        if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+            self.skipped = max(0, len(value) - MAX_PAYLOAD_ITEMS)
+            value = [_snapshot(value[i]) for i in range(self.skipped, len(value))]
+        elif isinstance(value, dict):
+            value = _snapshot(value)
+        self.value = value
+
+    def render(self):
+        value = self.value() if callable(self.value) else self.value
+        if self.skipped is not None:
+            items = [_render_item(item) for item in value]
+            if self.skipped:
+                return [f"... {self.skipped} earlier items", *items]
+            return items
+        return _render_item(value)
+
+    def __str__(self) -> str:
+        rendered = self.render()
+        return rendered if isinstance(rendered, str) else json.dumps(rendered, default=str)
+
+
+def _render_item(value):
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(text) > MAX_PAYLOAD_CHARS:
+        return f"{text[:MAX_PAYLOAD_CHARS]}... ({len(text) - MAX_PAYLOAD_CHARS} more chars)"
+    return value
+
+
+def log(debug: bool, level: int, message: str, **fields) -> None:
+    """
+    Logs `message` with structured `fields` to the "swarm" logger, and
+    prints it when `debug` is set, as `debug_print` did. When neither is
+    enabled it returns without touching the fields.
+    """
+    enabled = logger.isEnabledFor(level)
+    if not (debug or enabled):
+        return
+    payloads = {name: Payload(value) for name, value in fields.items()}
+    if debug:
+        debug_print(True, message, *(f"{name}={payload}" for name, payload in payloads.items()))
+    if enabled:
+        logger.log(level, message, extra={"swarm_fields": payloads})
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, with the structured
+    fields passed to `log` as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, payload in getattr(record, "swarm_fields", {}).items():
+            entry[name] = payload.render() if isinstance(payload, Payload) else payload
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "swarm_fields", {})
+        record.fields = " ".join(f"{name}={payload}" for name, payload in fields.items())
+        return super().format(record)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # hand the record over as is; fields are rendered on the listener thread
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    # stopping twice (explicitly, then at exit) is harmless
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    path: str = None,
+    stream=None,
+    json_format: bool = True,
+) -> logging.handlers.QueueListener:
+    """
+    Sends the "swarm" logger's records at `level` and above to a file at
+    `path`, or to `stream` (stdout by default), through a queue. Logging
+    calls only enqueue records; a listener thread renders and writes them.
+    Returns the started listener; it is stopped, flushing the queue, at exit.
+    """
+    if path:
+        handler = logging.FileHandler(path)
+    else:
+        handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(
+        JsonFormatter()
+        if json_format
+        else TextFormatter("%(asctime)s %(levelname)s %(name)s %(message)s %(fields)s")
+    )
+    records = queue.SimpleQueue()
+    listener = _QueueListener(records, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(_QueueHandler(records))
+    logger.setLevel(level)
+    return listener
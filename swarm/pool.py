@@ -0,0 +1,284 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+
+import httpx
+from openai import DEFAULT_CONNECTION_LIMITS, AsyncOpenAI, OpenAI
+from pydantic import BaseModel
+
+# httpcore trace events marking the moment a request got a connection
+_ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "connection.connect_unix_socket.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+
+class PoolStats(BaseModel):
+    """
+    A snapshot of a pooled client's HTTP connection pool.
+
+    Attributes:
+        requests (int): Requests sent through the pool.
+        in_use (int): Requests currently holding a connection, including
+            responses that are still streaming.
+        max_in_use (int): The highest value `in_use` has reached.
+        open_connections (int): Connections currently open (idle or active).
+        idle_connections (int): Open connections available for reuse.
+        total_wait (float): Seconds spent waiting for a connection, summed.
+        max_wait (float): The longest single wait for a connection, in seconds.
+    """
+
+    requests: int = 0
+    in_use: int = 0
+    max_in_use: int = 0
+    open_connections: int = 0
+    idle_connections: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class _PoolMonitor:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = PoolStats()
+
+    def start(self, request: httpx.Request, asynchronous: bool = False) -> None:
+        started = time.perf_counter()
+        waited = []
+        previous = request.extensions.get("trace")
+
+        def observe(event_name):
+            if not waited and event_name in _ACQUIRED_EVENTS:
+                waited.append(time.perf_counter() - started)
+                self._acquired(waited[0])
+
+        # httpcore awaits the trace callback on its async path
+        if asynchronous:
+
+            async def trace(event_name, info):
+                observe(event_name)
+                if previous is not None:
+                    await previous(event_name, info)
+
+        else:
+
+            def trace(event_name, info):
+                observe(event_name)
+                if previous is not None:
+                    previous(event_name, info)
+
+        request.extensions["trace"] = trace
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.in_use += 1
+            self.stats.max_in_use = max(self.stats.max_in_use, self.stats.in_use)
+
+    def _acquired(self, wait: float) -> None:
+        with self._lock:
+            self.stats.total_wait += wait
+            self.stats.max_wait = max(self.stats.max_wait, wait)
+
+    def release(self) -> None:
+        with self._lock:
+            self.stats.in_use -= 1
+
+    def snapshot(self, pools) -> PoolStats:
+        connections = [c for pool in pools for c in pool.connections]
+        with self._lock:
+            stats = self.stats.model_copy()
+        stats.open_connections = len(connections)
+        stats.idle_connections = sum(1 for c in connections if c.is_idle())
+        return stats
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    # a request holds its connection until the response body is closed
+    def __init__(self, stream, monitor: _PoolMonitor):
+        self._stream = stream
+        self._monitor = monitor
+        self._released = False
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._monitor.release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, monitor: _PoolMonitor):
+        self._stream = stream
+        self._monitor = monitor
+        self._released = False
+
+    async def __aiter__(self):
+        async for part in self._stream:
+            yield part
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._monitor.release()
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.monitor = _PoolMonitor()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.monitor.start(request)
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            self.monitor.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, self.monitor)
+        return response
+
+    def stats(self) -> PoolStats:
+        return self.monitor.snapshot([self._pool])
+
+
+class AsyncInstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Keeps one connection pool per event loop, since asyncio connections
+    cannot be used from a loop other than the one that opened them (as
+    happens with one `asyncio.run` per request). Pools of closed loops are
+    dropped; the statistics cover all pools.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._transports = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.monitor = _PoolMonitor()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for closed in [other for other in self._transports if other.is_closed()]:
+                del self._transports[closed]
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._kwargs)
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self._transport()
+        self.monitor.start(request, asynchronous=True)
+        try:
+            response = await transport.handle_async_request(request)
+        except BaseException:
+            self.monitor.release()
+            raise
+        response.stream = _AsyncReleasingStream(response.stream, self.monitor)
+        return response
+
+    async def aclose(self) -> None:
+        with self._lock:
+            transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            pools = [transport._pool for transport in self._transports.values()]
+        return self.monitor.snapshot(pools)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _pooled(client_cls, transport_cls, http_client_cls, max_connections,
+            max_keepalive_connections, keepalive_expiry, http2, client_kwargs):
+    # one client per configuration and process; forked workers get their own
+    key = (
+        os.getpid(),
+        client_cls.__name__,
+        max_connections,
+        max_keepalive_connections,
+        keepalive_expiry,
+        http2,
+        # canonical form, as arguments like default_headers are unhashable
+        json.dumps(client_kwargs, sort_keys=True, default=repr),
+    )
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            transport = transport_cls(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            )
+            client = client_cls(
+                http_client=http_client_cls(transport=transport), **client_kwargs
+            )
+            client._swarm_transport = transport
+            _clients[key] = client
+    return client
+
+
+def pooled_client(
+    max_connections: int = DEFAULT_CONNECTION_LIMITS.max_connections,
+    max_keepalive_connections: int = DEFAULT_CONNECTION_LIMITS.max_keepalive_connections,
+    keepalive_expiry: float = 30.0,
+    http2: bool = False,
+    **client_kwargs,
+) -> OpenAI:
+    """
+    Returns the process-wide `OpenAI` client for this pool configuration,
+    creating it on first use. Extra keyword arguments (api_key, base_url,
+    ...) are passed to `OpenAI` and are part of the configuration.
+    The connection limits default to those of `OpenAI` itself; idle
+    connections are kept longer (30s rather than 5s), so that they survive
+    the gap between one run's completions and the next run's.
+    HTTP/2 requires the `h2` package (`pip install httpx[http2]`).
+    """
+    return _pooled(OpenAI, InstrumentedTransport, httpx.Client, max_connections,
+                   max_keepalive_connections, keepalive_expiry, http2, client_kwargs)
+
+
+def pooled_async_client(
+    max_connections: int = DEFAULT_CONNECTION_LIMITS.max_connections,
+    max_keepalive_connections: int = DEFAULT_CONNECTION_LIMITS.max_keepalive_connections,
+    keepalive_expiry: float = 30.0,
+    http2: bool = False,
+    **client_kwargs,
+) -> AsyncOpenAI:
+    """
+    The `AsyncOpenAI` counterpart of `pooled_client`.
+    """
+    return _pooled(AsyncOpenAI, AsyncInstrumentedTransport, httpx.AsyncClient,
+                   max_connections, max_keepalive_connections, keepalive_expiry,
+                   http2, client_kwargs)
+
+
+def pool_stats(client) -> PoolStats:
+    """
+    Returns the current pool statistics of a client created by
+    `pooled_client` or `pooled_async_client`, or None for any other client.
+    """
+    transport = getattr(client, "_swarm_transport", None)
+    return transport.stats() if transport is not None else None
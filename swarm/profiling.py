@@ -0,0 +1,168 @@
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from .hooks import HookEvent, RunHooks
+
+
+def _covered(intervals: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    # merge overlapping intervals, e.g. concurrent tool calls
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _length(intervals: List[Tuple[float, float]]) -> float:
+    return sum(end - start for start, end in intervals)
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+        names.append(f"{module}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _sample(profiler_ref, stop: threading.Event, driver: threading.Thread, interval: float):
+    # holds the profiler weakly and watches the driving thread, so a run
+    # that never reaches on_run_end does not leave this thread behind
+    while not stop.wait(interval):
+        profiler = profiler_ref()
+        if profiler is None or not driver.is_alive():
+            return
+        profiler._sample()
+        del profiler
+
+
+class RunProfiler(RunHooks):
+    """
+    Profiles a single run. Pass one to `Swarm.run(..., profile=...)`.
+
+    While the run is in progress, a background thread samples the stacks
+    of the thread driving the run, and of threads executing its tools,
+    every `interval` seconds. Each sample walks every frame in Python, so
+    short intervals inflate the `cpu` and `swarm` phases being measured.
+    The result is in `stacks`, a `Counter` of collapsed stacks
+    ("module:function;module:function" → samples). Sampling stops when the
+    run ends, when the driving thread exits, or when the profiler is
+    garbage-collected.
+    `write_collapsed` saves them in the format flame graph tools such as
+    flamegraph.pl and speedscope read.
+
+    Lifecycle events give a per-phase breakdown in `phases`, in seconds:
+    `llm_wait` (from each completion request to its end, including the
+    stream), `tool_execution` (running functions outside LLM waits),
+    `swarm` (everything else, i.e. orchestration overhead) and `total`.
+    `cpu` is the CPU time of the thread driving the run.
+
+    With a `path`, both are written when the run ends: the collapsed
+    stacks to `path` and the phases to the same path with a
+    `.phases.json` suffix instead of its extension.
+
+    For `AsyncSwarm`, the driving thread is the event loop's, so samples
+    include any other work running on that loop.
+    """
+
+    def __init__(self, path: str = None, interval: float = 0.01):
+        self.path = path
+        self.interval = interval
+        self.run_id = None
+        self.stacks = Counter()
+        self.phases: Dict[str, float] = {}
+        self._thread_id = None
+        self._tool_threads = {}
+        self._llm = []
+        self._tools = []
+        self._open = {}
+        self._start = None
+        self._cpu_start = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        with self._lock:
+            thread_ids = {self._thread_id, *self._tool_threads.values()}
+        for thread_id in thread_ids:
+            frame = frames.get(thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def _ours(self, event: HookEvent) -> bool:
+        return event.run_id == self.run_id
+
+    def on_run_start(self, event: HookEvent) -> None:
+        if self.run_id is not None:
+            return
+        self.run_id = event.run_id
+        self._thread_id = threading.get_ident()
+        self._start = event.timestamp
+        self._cpu_start = time.thread_time()
+        self._sampler = threading.Thread(
+            target=_sample,
+            args=(weakref.ref(self), self._stop, threading.current_thread(), self.interval),
+            name="swarm-profiler",
+            daemon=True,
+        )
+        self._sampler.start()
+
+    def on_llm_request(self, event: HookEvent) -> None:
+        if self._ours(event):
+            self._open["llm"] = event.timestamp
+
+    def on_llm_end(self, event: HookEvent) -> None:
+        if self._ours(event) and "llm" in self._open:
+            self._llm.append((self._open.pop("llm"), event.timestamp))
+
+    def on_tool_start(self, event: HookEvent) -> None:
+        if self._ours(event):
+            with self._lock:
+                self._open[event.tool_call_id] = event.timestamp
+                self._tool_threads[event.tool_call_id] = threading.get_ident()
+
+    def on_tool_end(self, event: HookEvent) -> None:
+        if self._ours(event):
+            with self._lock:
+                self._tool_threads.pop(event.tool_call_id, None)
+                start = self._open.pop(event.tool_call_id, None)
+                if start is not None:
+                    self._tools.append((start, event.timestamp))
+
+    def on_run_end(self, event: HookEvent) -> None:
+        if not self._ours(event):
+            return
+        self._stop.set()
+        self._sampler.join()
+
+        total = event.timestamp - self._start
+        llm = _covered(self._llm)
+        busy = _covered(self._llm + self._tools)
+        self.phases = {
+            "total": total,
+            "llm_wait": _length(llm),
+            "tool_execution": _length(busy) - _length(llm),
+            "swarm": total - _length(busy),
+            "cpu": time.thread_time() - self._cpu_start,
+        }
+        if self.path:
+            self.write_collapsed(self.path)
+            with open(os.path.splitext(self.path)[0] + ".phases.json", "w") as f:
+                json.dump(self.phases, f, indent=2)
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
@@ -0,0 +1,144 @@
+import asyncio
+import contextlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: only FileBackend needs it
+    fcntl = None
+
+from .history import estimate_tokens
+
+
+class MemoryBackend:
+    """
+    Keeps bucket state in this process; share one instance between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    @contextlib.contextmanager
+    def transaction(self):
+        with self._lock:
+            yield self._state
+
+
+class FileBackend:
+    """
+    Keeps bucket state in a small JSON file guarded by an exclusive `flock`,
+    so every process using the same path shares the same buckets. Put the
+    file on a tmpfs such as `/dev/shm` to keep it in shared memory.
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("FileBackend requires a POSIX system (fcntl.flock).")
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.read(fd, 1 << 16)
+                state = json.loads(raw) if raw else {}
+                yield state
+                data = json.dumps(state).encode("utf-8")
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, data)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+class RateLimiter:
+    """
+    A token-bucket limiter for requests per minute and (estimated) tokens
+    per minute, consulted by `Swarm` before every completion request.
+
+    Each bucket holds up to a minute's quota and refills continuously, so
+    requests flow steadily at the quota instead of in bursts that trigger
+    429s. Share one limiter between threads, or give limiters in several
+    processes the same `FileBackend`.
+
+    Args:
+        requests_per_minute: The request quota, or None for no request limit.
+        tokens_per_minute: The token quota, or None for no token limit.
+        backend: Where bucket state lives. A new `MemoryBackend` if None.
+        estimator: Estimates the prompt tokens of a message.
+        name: Prefix for the bucket names, to share a backend between quotas.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        backend=None,
+        estimator=estimate_tokens,
+        name: str = "openai",
+    ):
+        self.limits = {}
+        if requests_per_minute:
+            self.limits[f"{name}:requests"] = requests_per_minute
+        if tokens_per_minute:
+            self.limits[f"{name}:tokens"] = tokens_per_minute
+        self.backend = backend or MemoryBackend()
+        self.estimator = estimator
+        self._requests_bucket = f"{name}:requests"
+        self._tokens_bucket = f"{name}:tokens"
+
+    def estimate(self, create_params: dict) -> int:
+        return sum(self.estimator(message) for message in create_params.get("messages") or [])
+
+    def try_acquire(self, tokens: int = 0) -> float:
+        """
+        Takes one request and `tokens` tokens if both are available and
+        returns 0, or takes nothing and returns how long to wait, in seconds.
+        """
+        cost = {self._requests_bucket: 1, self._tokens_bucket: tokens}
+        now = time.time()
+        with self.backend.transaction() as state:
+            levels = {}
+            wait = 0.0
+            for bucket, per_minute in self.limits.items():
+                level, updated = state.get(bucket, (per_minute, now))
+                level = min(per_minute, level + (now - updated) * per_minute / 60)
+                # a request larger than the whole quota waits for a full bucket
+                needed = min(cost[bucket], per_minute)
+                if level < needed:
+                    wait = max(wait, (needed - level) * 60 / per_minute)
+                levels[bucket] = level
+            for bucket, level in levels.items():
+                if not wait:
+                    level -= min(cost[bucket], self.limits[bucket])
+                state[bucket] = (level, now)
+        return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Blocks until the request fits the quota; returns the time waited.
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
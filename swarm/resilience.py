@@ -0,0 +1,216 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Tuple, Type
+
+import openai
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+)
+
+
+class RetryPolicy:
+    """
+    Retries a completion request on transient errors with exponential
+    backoff and full jitter, honouring `Retry-After` headers when the
+    server sends them.
+
+    Args:
+        max_retries: Retries after the first attempt before giving up.
+        initial_delay: The backoff ceiling, in seconds, for the first retry.
+        max_delay: The largest delay between two attempts, in seconds.
+        multiplier: How much the backoff ceiling grows after each retry.
+        jitter: Sleep a random time up to the ceiling, so concurrent runs
+            that failed together do not retry together.
+        retry_on: The exception types that are retried.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        initial_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        retry_on: Tuple[Type[BaseException], ...] = RETRYABLE_ERRORS,
+    ):
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_on = retry_on
+
+    def delay(self, attempt: int, error: BaseException = None) -> float:
+        ceiling = min(self.max_delay, self.initial_delay * self.multiplier**attempt)
+        delay = random.uniform(0, ceiling) if self.jitter else ceiling
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            delay = max(delay, min(self.max_delay, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        return delay
+
+    def call(self, create: Callable):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return create()
+            except self.retry_on as e:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.delay(attempt, e))
+
+    async def acall(self, create: Callable):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await create()
+            except self.retry_on as e:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.delay(attempt, e))
+
+
+def _discard(result) -> None:
+    # close a losing streamed response so its connection is released
+    close = getattr(result, "close", None)
+    if callable(close):
+        close()
+
+
+async def _adiscard(result) -> None:
+    close = getattr(result, "close", None)
+    if callable(close):
+        closed = close()
+        if asyncio.iscoroutine(closed):
+            await closed
+
+
+class HedgePolicy:
+    """
+    Sends a duplicate request when the first one has not responded within a
+    latency threshold, and uses whichever responds first.
+
+    For streamed requests, responding means the response has started (the
+    headers arrived); for regular requests it means the whole completion.
+    The threshold is the `quantile` of recently observed latencies, or
+    `initial_threshold` until `min_samples` latencies have been seen.
+
+    Args:
+        quantile: The latency quantile after which a request is hedged.
+        initial_threshold: The threshold used before enough samples exist, in seconds.
+        min_samples: Latencies required before the quantile is used.
+        window: How many recent latencies are kept.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        initial_threshold: float = 2.0,
+        min_samples: int = 20,
+        window: int = 500,
+    ):
+        self.quantile = quantile
+        self.initial_threshold = initial_threshold
+        self.min_samples = min_samples
+        self.hedged = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def threshold(self) -> float:
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_threshold
+            latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(self.quantile * len(latencies)))
+        return latencies[index]
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    @staticmethod
+    def _start(create: Callable) -> Future:
+        # every attempt gets its own thread, so requests never queue behind
+        # each other and the clock starts when the request does
+        future = Future()
+
+        def attempt():
+            started = time.perf_counter()
+            try:
+                result = create()
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result((result, time.perf_counter() - started))
+
+        threading.Thread(target=attempt, name="swarm-hedge", daemon=True).start()
+        return future
+
+    def call(self, create: Callable):
+        primary = self._start(create)
+        done, _ = wait([primary], timeout=self.threshold())
+        futures = [primary]
+        if not done:
+            with self._lock:
+                self.hedged += 1
+            futures.append(self._start(create))
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                result, latency = future.result()
+                self.observe(latency)
+                for loser in futures:
+                    if loser is not future:
+                        loser.add_done_callback(
+                            lambda f: f.exception() is None and _discard(f.result()[0])
+                        )
+                return result
+        raise error
+
+    @staticmethod
+    async def _atimed(create: Callable):
+        started = time.perf_counter()
+        result = await create()
+        return result, time.perf_counter() - started
+
+    async def acall(self, create: Callable):
+        primary = asyncio.ensure_future(self._atimed(create))
+        done, _ = await asyncio.wait([primary], timeout=self.threshold())
+        tasks = [primary]
+        if not done:
+            with self._lock:
+                self.hedged += 1
+            tasks.append(asyncio.ensure_future(self._atimed(create)))
+
+        pending = set(tasks)
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    result, latency = task.result()
+                    self.observe(latency)
+                    for loser in done - {task}:
+                        if loser.exception() is None:
+                            await _adiscard(loser.result()[0])
+                    return result
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,250 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Union
+
+from pydantic import BaseModel
+
+from .types import Agent, Response
+
+
+class SessionState(BaseModel):
+    """
+    The persisted state of a conversation.
+
+    Attributes:
+        messages (List): The full history, oldest first.
+        agent (str): The name of the active agent, or None before the first turn.
+        context_variables (dict): The context variables after the last turn.
+    """
+
+    messages: List = []
+    agent: Optional[str] = None
+    context_variables: dict = {}
+
+
+class MemoryStore:
+    """
+    Keeps sessions in this process. Share one instance between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, SessionState] = {}
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            return state.model_copy(update={"messages": list(state.messages)}) if state else None
+
+    def append(self, session_id: str, messages: List, agent: str, context_variables: dict) -> None:
+        with self._lock:
+            state = self._sessions.setdefault(session_id, SessionState(messages=[]))
+            state.messages.extend(messages)
+            state.agent = agent
+            state.context_variables = dict(context_variables)
+
+
+class SQLiteStore:
+    """
+    Keeps sessions in a SQLite database: one row per message, plus one row
+    per session for its agent and context variables. A turn inserts only
+    its new messages.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS session_messages (
+                session_id TEXT, position INTEGER, message TEXT,
+                PRIMARY KEY (session_id, position)
+            );
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY, agent TEXT, context_variables TEXT,
+                length INTEGER
+            );
+            """
+        )
+        self._db.commit()
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT agent, context_variables FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            messages = self._db.execute(
+                "SELECT message FROM session_messages WHERE session_id = ? ORDER BY position",
+                (session_id,),
+            ).fetchall()
+        return SessionState(
+            messages=[json.loads(m) for (m,) in messages],
+            agent=row[0],
+            context_variables=json.loads(row[1]),
+        )
+
+    def append(self, session_id: str, messages: List, agent: str, context_variables: dict) -> None:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT length FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            start = row[0] if row else 0
+            self._db.executemany(
+                "INSERT INTO session_messages (session_id, position, message) VALUES (?, ?, ?)",
+                [
+                    (session_id, start + i, json.dumps(message))
+                    for i, message in enumerate(messages)
+                ],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, agent, context_variables, length) "
+                "VALUES (?, ?, ?, ?)",
+                (session_id, agent, json.dumps(context_variables),
+                 start + len(messages)),
+            )
+
+
+class JsonlStore:
+    """
+    Keeps each session in an append-only JSONL file in `directory`: every
+    turn appends one line with its new messages, the active agent and the
+    context variables. Loading replays the file.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, session_id: str) -> str:
+        if os.sep in session_id or session_id in ("", ".", ".."):
+            raise ValueError(f"Invalid session id for a file store: {session_id!r}")
+        return os.path.join(self.directory, f"{session_id}.jsonl")
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        path = self._path(session_id)
+        if not os.path.exists(path):
+            return None
+        state = SessionState(messages=[])
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # a turn cut short while it was being written
+                entry = json.loads(line)
+                state.messages.extend(entry["messages"])
+                state.agent = entry["agent"]
+                state.context_variables = entry["context_variables"]
+        return state
+
+    def append(self, session_id: str, messages: List, agent: str, context_variables: dict) -> None:
+        line = json.dumps(
+            {"messages": messages, "agent": agent, "context_variables": context_variables}
+        )
+        with self._lock, open(self._path(session_id), "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class Session:
+    """
+    A conversation that keeps its own history, active agent and context
+    variables, so each turn only sends the new user message. Create one
+    with `Swarm.session`.
+
+    Only a turn's new messages are appended to the store, so the cost of a
+    turn does not grow with the length of the conversation (apart from the
+    prompt sent to the model).
+
+    Args:
+        swarm: The `Swarm` that runs the turns.
+        session_id: Identifies the conversation in the store.
+        agent: The agent of a new session.
+        store: Where the session is persisted.
+        agents: Further agents the session may be handed off to, used to
+            restore the active agent by name when the session is reloaded.
+    """
+
+    def __init__(self, swarm, session_id: str, agent: Agent, store, agents: Iterable[Agent] = ()):
+        self.swarm = swarm
+        self.session_id = session_id
+        self.store = store
+        self.agents = {a.name: a for a in [agent, *agents]}
+        state = store.load(session_id) or SessionState(messages=[])
+        self.messages = state.messages
+        self.context_variables = state.context_variables
+        self.agent = self._agent(state.agent) if state.agent else agent
+
+    def _agent(self, name: str) -> Agent:
+        if name not in self.agents:
+            raise ValueError(
+                f"Session {self.session_id} was handed off to unknown agent {name!r}; "
+                "pass it in `agents`."
+            )
+        return self.agents[name]
+
+    def _user_message(self, message: Union[str, dict]) -> dict:
+        if isinstance(message, str):
+            message = {"role": "user", "content": message}
+        self.messages.append(message)
+        return message
+
+    def _commit(self, message: dict, response: Response) -> Response:
+        # persist first: a turn the store rejects is not kept in memory either
+        self.store.append(
+            self.session_id,
+            [message, *response.messages],
+            response.agent.name,
+            response.context_variables,
+        )
+        self.messages.extend(response.messages)
+        self.context_variables = response.context_variables
+        self.agent = response.agent
+        self.agents.setdefault(response.agent.name, response.agent)
+        return response
+
+    def send(self, message: Union[str, dict], **run_kwargs) -> Response:
+        """
+        Runs a turn with a user message (a string or a message dict) and
+        returns its `Response`. Other keyword arguments go to `Swarm.run`;
+        streaming is not supported. If the run raises, or the store rejects
+        the turn (e.g. values that are not JSON-serializable), the session is
+        left as it was.
+        """
+        start = len(self.messages)
+        message = self._user_message(message)
+        try:
+            response = self.swarm.run(
+                agent=self.agent,
+                messages=self.messages,
+                context_variables=self.context_variables,
+                **run_kwargs,
+            )
+            return self._commit(message, response)
+        except BaseException:
+            del self.messages[start:]
+            raise
+
+
+class AsyncSession(Session):
+    """
+    The `AsyncSwarm` counterpart of `Session`; `send` is a coroutine.
+    """
+
+    async def send(self, message: Union[str, dict], **run_kwargs) -> Response:
+        start = len(self.messages)
+        message = self._user_message(message)
+        try:
+            response = await self.swarm.run(
+                agent=self.agent,
+                messages=self.messages,
+                context_variables=self.context_variables,
+                **run_kwargs,
+            )
+            return self._commit(message, response)
+        except BaseException:
+            del self.messages[start:]
+            raise
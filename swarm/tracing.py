@@ -0,0 +1,304 @@
+import json
+import os
+import queue
+import threading
+import time
+from typing import List
+
+from .hooks import HookEvent, RunHooks
+
+
+def _attribute_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_attribute_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    """
+    A timed operation of a run. `to_dict` renders it in the OTLP/JSON span
+    shape; `export_request` wraps spans in the envelope OTLP tooling reads.
+    """
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "start", "end",
+                 "attributes", "error")
+
+    def __init__(self, trace_id: str, name: str, start: int, parent_span_id: str = None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.start = start
+        self.end = None
+        self.attributes = {}
+        self.error = None
+
+    def to_dict(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": [
+                {"key": key, "value": _attribute_value(value)}
+                for key, value in self.attributes.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def export_request(spans: List[Span]) -> dict:
+    """
+    Returns an OTLP/JSON `ExportTraceServiceRequest` holding `spans`, the
+    shape read by the OpenTelemetry Collector's file receiver and OTLP/HTTP
+    endpoints.
+    """
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": "swarm"}}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "swarm.tracing"},
+                        "spans": [span.to_dict() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class JsonlSpanExporter:
+    """
+    Appends finished spans to a JSONL file. Each line is an OTLP/JSON export
+    request (see `export_request`) holding one batch of spans.
+
+    `export` only puts the span on a queue; a background thread writes
+    batches of up to `max_batch` spans, at least every `flush_interval`
+    seconds. When the queue holds `max_queue` spans, new spans are dropped
+    and counted in `dropped` rather than blocking the run.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_batch: int = 512,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+    ):
+        self.path = path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(
+            target=self._worker, name="swarm-span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Blocks until every span exported so far is written."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def shutdown(self) -> None:
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _worker(self) -> None:
+        while True:
+            batch, waiters, stop = [], [], False
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+                    if stop or len(batch) >= self.max_batch:
+                        break
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch:
+                line = json.dumps(export_request(batch)) + "\n"
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+
+class _RunTrace:
+    __slots__ = ("run", "turn", "llm", "tools")
+
+    def __init__(self, run: Span):
+        self.run = run
+        self.turn = None
+        self.llm = None
+        self.tools = {}
+
+
+class Tracer(RunHooks):
+    """
+    Builds a span tree for each run from its lifecycle events and hands
+    finished spans to `exporter`:
+
+        run → turn → llm / tool / handoff
+
+    The trace id is the run id. Pass a path instead of an exporter to write
+    to a `JsonlSpanExporter`.
+    """
+
+    def __init__(self, exporter):
+        if isinstance(exporter, (str, os.PathLike)):
+            exporter = JsonlSpanExporter(exporter)
+        self.exporter = exporter
+        self._runs = {}
+        self._lock = threading.Lock()
+        # hook timestamps are monotonic; spans need wall-clock nanoseconds
+        self._offset = time.time() - time.monotonic()
+
+    def _nanos(self, event: HookEvent) -> int:
+        return int((event.timestamp + self._offset) * 1e9)
+
+    def _start(self, trace: _RunTrace, name: str, event: HookEvent, parent: Span) -> Span:
+        span = Span(trace.run.trace_id, name, self._nanos(event), parent.span_id)
+        span.attributes["swarm.agent"] = event.agent
+        return span
+
+    def _end(self, span: Span, event: HookEvent) -> None:
+        if span is not None and span.end is None:
+            span.end = self._nanos(event)
+            self.exporter.export(span)
+
+    def on_run_start(self, event: HookEvent) -> None:
+        span = Span(event.run_id, "swarm.run", self._nanos(event))
+        span.attributes["swarm.agent"] = event.agent
+        span.attributes["swarm.run.input_messages"] = event.message_count
+        span.attributes["swarm.context_variables"] = event.data.get("context_variables")
+        with self._lock:
+            self._runs[event.run_id] = _RunTrace(span)
+
+    def on_turn_start(self, event: HookEvent) -> None:
+        with self._lock:
+            trace = self._runs.get(event.run_id)
+            if trace is None:
+                return
+            self._end(trace.turn, event)
+            trace.turn = self._start(trace, "swarm.turn", event, trace.run)
+            trace.turn.attributes["swarm.turn"] = event.turn
+            trace.turn.attributes["swarm.message_count"] = event.message_count
+            trace.turn.attributes["swarm.context_variables"] = event.data.get("context_variables")
+
+    def on_llm_request(self, event: HookEvent) -> None:
+        with self._lock:
+            trace = self._runs.get(event.run_id)
+            if trace is None:
+                return
+            trace.llm = self._start(trace, "swarm.llm", event, trace.turn or trace.run)
+            trace.llm.attributes["gen_ai.request.model"] = event.model
+            trace.llm.attributes["swarm.message_count"] = event.message_count
+
+    def on_first_token(self, event: HookEvent) -> None:
+        with self._lock:
+            trace = self._runs.get(event.run_id)
+            if trace is not None and trace.llm is not None:
+                trace.llm.attributes["swarm.llm.time_to_first_token_ms"] = (
+                    (self._nanos(event) - trace.llm.start) / 1e6
+                )
+
+    def on_llm_end(self, event: HookEvent) -> None:
+        with self._lock:
+            trace = self._runs.get(event.run_id)
+            if trace is None or trace.llm is None:
+                return
+            span, trace.llm = trace.llm, None
+            span.attributes["swarm.llm.tool_calls"] = event.data.get("tool_calls")
+            usage = event.data.get("usage")
+            if usage is not None:
+                span.attributes["gen_ai.usage.input_tokens"] = getattr(usage, "prompt_tokens", None)
+                span.attributes["gen_ai.usage.output_tokens"] = getattr(
+                    usage, "completion_tokens", None
+                )
+            self._end(span, event)
+
+    def on_tool_start(self, event: HookEvent) -> None:
+        with self._lock:
+            trace = self._runs.get(event.run_id)
+            if trace is None:
+                return
+            span = self._start(trace, "swarm.tool", event, trace.turn or trace.run)
+            span.attributes["swarm.tool.name"] = event.tool
+            span.attributes["swarm.tool.call_id"] = event.tool_call_id
+            span.attributes["swarm.tool.arguments_size"] = event.data.get("arguments_size")
+            trace.tools[event.tool_call_id] = span
+
+    def on_tool_end(self, event: HookEvent) -> None:
+        with self._lock:
+            trace = self._runs.get(event.run_id)
+            span = trace and trace.tools.pop(event.tool_call_id, None)
+            if span is None:
+                return
+            if "error" in event.data:
+                span.error = repr(event.data["error"])
+            else:
+                span.attributes["swarm.tool.result_size"] = event.data.get("result_size")
+                span.attributes["swarm.tool.handoff"] = event.data.get("handoff")
+                span.attributes["swarm.context_variables"] = event.data.get("context_variables")
+            self._end(span, event)
+
+    def on_handoff(self, event: HookEvent) -> None:
+        with self._lock:
+            trace = self._runs.get(event.run_id)
+            if trace is None:
+                return
+            span = self._start(trace, "swarm.handoff", event, trace.turn or trace.run)
+            span.attributes["swarm.handoff.to"] = event.data.get("to")
+            self._end(span, event)
+
+    def on_run_end(self, event: HookEvent) -> None:
+        with self._lock:
+            trace = self._runs.pop(event.run_id, None)
+            if trace is None:
+                return
+            error = event.data.get("error")
+            for span in [*trace.tools.values(), trace.llm, trace.turn]:
+                if span is not None and error is not None:
+                    span.error = span.error or repr(error)
+                self._end(span, event)
+            trace.run.attributes["swarm.agent.final"] = event.agent
+            trace.run.attributes["swarm.turns"] = event.turn
+            trace.run.attributes["swarm.message_count"] = event.message_count
+            if error is not None:
+                trace.run.error = repr(error)
+            if event.data.get("closed"):
+                trace.run.attributes["swarm.stream.closed"] = True
+            self._end(trace.run, event)
@@ -3,10 +3,10 @@ from openai.types.chat.chat_completion_message_tool_call import (
     ChatCompletionMessageToolCall,
     Function,
 )
-from typing import List, Callable, Union, Optional
+from typing import Dict, List, Callable, Union, Optional
 
 # Third-party imports
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 AgentFunction = Callable[[], Union[str, "Agent", dict]]
 
@@ -20,10 +20,89 @@ class Agent(BaseModel):
     parallel_tool_calls: bool = True
 
 
+class Usage(BaseModel):
+    """
+    Token usage of one or more completion requests.
+
+    Attributes:
+        requests (int): The number of completions counted.
+        prompt_tokens (int): Input tokens, including cached ones.
+        completion_tokens (int): Output tokens.
+        cached_tokens (int): Input tokens served from the provider's prompt cache.
+        total_tokens (int): Input plus output tokens.
+    """
+
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    total_tokens: int = 0
+
+    @classmethod
+    def from_completion(cls, usage) -> "Usage":
+        """
+        Converts the `usage` block of a completion (an OpenAI
+        `CompletionUsage`, a dict or None) into a one-request `Usage`.
+        """
+        if usage is None:
+            return cls(requests=1)
+        if not isinstance(usage, dict):
+            usage = usage.model_dump()
+        details = usage.get("prompt_tokens_details") or {}
+        return cls(
+            requests=1,
+            prompt_tokens=usage.get("prompt_tokens") or 0,
+            completion_tokens=usage.get("completion_tokens") or 0,
+            cached_tokens=details.get("cached_tokens") or 0,
+            total_tokens=usage.get("total_tokens") or 0,
+        )
+
+    def add(self, other: "Usage") -> None:
+        self.requests += other.requests
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        self.total_tokens += other.total_tokens
+
+    def cost(
+        self,
+        input_per_million: float,
+        output_per_million: float,
+        cached_input_per_million: float = None,
+    ) -> float:
+        """
+        Returns the price of this usage given per-million-token prices.
+        Cached input tokens are billed at `cached_input_per_million` when
+        given, and at the regular input price otherwise.
+        """
+        if cached_input_per_million is None:
+            cached_input_per_million = input_per_million
+        uncached = self.prompt_tokens - self.cached_tokens
+        return (
+            uncached * input_per_million
+            + self.cached_tokens * cached_input_per_million
+            + self.completion_tokens * output_per_million
+        ) / 1_000_000
+
+
+class RunUsage(Usage):
+    """
+    Token usage of a run: the totals, plus `agents`, the totals of the
+    completions requested by each agent, keyed by agent name.
+    """
+
+    agents: Dict[str, Usage] = {}
+
+    def record(self, agent: str, usage: Usage) -> None:
+        self.add(usage)
+        self.agents.setdefault(agent, Usage()).add(usage)
+
+
 class Response(BaseModel):
     messages: List = []
     agent: Optional[Agent] = None
     context_variables: dict = {}
+    usage: RunUsage = RunUsage()
 
 
 class Result(BaseModel):
@@ -39,3 +118,20 @@ class Result(BaseModel):
     value: str = ""
     agent: Optional[Agent] = None
     context_variables: dict = {}
+
+
+class BatchResult(BaseModel):
+    """
+    The outcome of a single job submitted to `Swarm.run_many`.
+
+    Attributes:
+        index (int): The position of the job in the submitted iterable.
+        response (Response): The response of the run, if it succeeded.
+        error (Exception): The exception raised by the run, if it failed.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: int
+    response: Optional[Response] = None
+    error: Optional[Exception] = None
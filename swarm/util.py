@@ -1,4 +1,7 @@
+import asyncio
 import inspect
+import json
+import threading
 from datetime import datetime
 
 
@@ -10,6 +13,46 @@ def debug_print(debug: bool, *args: str) -> None:
     print(f"\033[97m[\033[90m{timestamp}\033[97m]\033[90m {message}\033[0m")
 
 
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the process-wide event loop used to run coroutine agent functions
+    from synchronous code, starting it on a daemon thread on first use.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever,
+                name="swarm-background-loop",
+                daemon=True,
+            ).start()
+    return _background_loop
+
+
+def run_coroutine_sync(coro):
+    """
+    Runs a coroutine on the shared background loop and blocks until it
+    finishes, instead of paying for a new event loop per call.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop()).result()
+
+
+def model_to_dict(model) -> dict:
+    """
+    Converts an OpenAI response object (e.g. a `ChatCompletionMessage` or a
+    streaming delta) to the plain dicts Swarm keeps in its history.
+
+    Equivalent to `json.loads(model.model_dump_json())` for these types,
+    without the serialize/parse round trip.
+    """
+    return model.model_dump()
+
+
 def merge_fields(target, source):
     for key, value in source.items():
         if isinstance(value, str):
@@ -28,6 +71,103 @@ def merge_chunk(final_response: dict, delta: dict) -> None:
         merge_fields(final_response["tool_calls"][index], tool_calls[0])
 
 
+class StreamAccumulator:
+    """
+    Assembles a streamed assistant message from its deltas.
+
+    Content and tool call fragments are buffered in lists and joined once
+    when the message is read, so accumulating a long response is linear in
+    its length. Each delta may carry fragments for several tool calls.
+
+    Args:
+        sender: The name of the agent producing the message.
+    """
+
+    def __init__(self, sender: str):
+        self.sender = sender
+        self._content = []
+        self._tool_calls = {}
+        self._touched = set()
+        self._completed = set()
+        self._message = None
+
+    def add(self, delta: dict) -> None:
+        content = delta.get("content")
+        if content:
+            self._content.append(content)
+
+        for tool_call in delta.get("tool_calls") or []:
+            index = tool_call.get("index") or 0
+            fragments = self._tool_calls.get(index)
+            if fragments is None:
+                fragments = self._tool_calls[index] = {
+                    "id": [],
+                    "type": [],
+                    "name": [],
+                    "arguments": [],
+                }
+            self._touched.add(index)
+            function = tool_call.get("function") or {}
+            for key, value in (
+                ("id", tool_call.get("id")),
+                ("type", tool_call.get("type")),
+                ("name", function.get("name")),
+                ("arguments", function.get("arguments")),
+            ):
+                if value:
+                    fragments[key].append(value)
+
+        self._message = None
+
+    def tool_call(self, index: int) -> dict:
+        fragments = self._tool_calls[index]
+        return {
+            "function": {
+                "arguments": "".join(fragments["arguments"]),
+                "name": "".join(fragments["name"]),
+            },
+            "id": "".join(fragments["id"]),
+            "type": "".join(fragments["type"]),
+        }
+
+    def completed_tool_calls(self) -> list:
+        """
+        Returns the tool calls whose arguments became complete, valid JSON
+        since the last call. A JSON object cannot be extended into another
+        valid object, so a parse that succeeds means the arguments are final.
+        """
+        completed = []
+        for index in sorted(self._touched - self._completed):
+            arguments = self._tool_calls[index]["arguments"]
+            if not arguments or not arguments[-1].rstrip().endswith("}"):
+                continue
+            tool_call = self.tool_call(index)
+            try:
+                json.loads(tool_call["function"]["arguments"])
+            except ValueError:
+                continue
+            self._completed.add(index)
+            completed.append(tool_call)
+        self._touched.clear()
+        return completed
+
+    def message(self) -> dict:
+        """
+        Returns the message assembled so far. The result is cached until the
+        next delta is added, so taking snapshots between deltas is cheap.
+        """
+        if self._message is None:
+            tool_calls = [self.tool_call(index) for index in sorted(self._tool_calls)]
+            self._message = {
+                "content": "".join(self._content),
+                "sender": self.sender,
+                "role": "assistant",
+                "function_call": None,
+                "tool_calls": tool_calls or None,
+            }
+        return self._message
+
+
 def function_to_json(func) -> dict:
     """
     Converts a Python function into a JSON-serializable dictionary
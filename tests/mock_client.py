@@ -1,43 +1,25 @@
-from unittest.mock import MagicMock
-from swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
-from openai import OpenAI
-from openai.types.chat.chat_completion import ChatCompletion, Choice
-import json
-
-
-def create_mock_response(message, function_calls=[], model="gpt-4o"):
-    role = message.get("role", "assistant")
-    content = message.get("content", "")
-    tool_calls = (
-        [
-            ChatCompletionMessageToolCall(
-                id="mock_tc_id",
-                type="function",
-                function=Function(
-                    name=call.get("name", ""),
-                    arguments=json.dumps(call.get("args", {})),
-                ),
-            )
-            for call in function_calls
-        ]
-        if function_calls
-        else None
+from unittest.mock import AsyncMock, MagicMock
+from openai.types.chat.chat_completion import ChatCompletion
+from swarm.bench.mock import chunks, completion
+
+
+def create_mock_response(message, function_calls=[], model="gpt-4o", usage=None):
+    return completion(
+        {"content": message.get("content", ""), "tool_calls": function_calls}, model, usage
     )
 
-    return ChatCompletion(
-        id="mock_cc_id",
-        created=1234567890,
-        model=model,
-        object="chat.completion",
-        choices=[
-            Choice(
-                message=ChatCompletionMessage(
-                    role=role, content=content, tool_calls=tool_calls
-                ),
-                finish_reason="stop",
-                index=0,
-            )
-        ],
+
+def create_mock_stream(message, function_calls=[], model="gpt-4o", chunk_size=4, usage=None):
+    """
+    Build the list of ChatCompletionChunks a streamed completion would yield,
+    splitting content and each tool call's arguments into chunk_size pieces.
+    With usage, a last chunk without choices carries it, as with include_usage.
+    """
+    return chunks(
+        {"content": message.get("content", ""), "tool_calls": function_calls},
+        model,
+        chunk_size,
+        usage,
     )
 
 
@@ -64,6 +46,12 @@ class MockOpenAIClient:
         self.chat.completions.create.assert_called_with(**kwargs)
 
 
+class AsyncMockOpenAIClient(MockOpenAIClient):
+    def __init__(self):
+        super().__init__()
+        self.chat.completions.create = AsyncMock()
+
+
 # Initialize the mock client
 client = MockOpenAIClient()
 
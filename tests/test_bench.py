@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import openai
+import pytest
+
+from swarm import Agent, AsyncSwarm, Swarm
+from swarm.bench import (
+    AsyncScriptedClient,
+    LatencyProfile,
+    ScriptedClient,
+    compare,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+from swarm.bench.__main__ import main
+from swarm.bench.load import load_agent, run_load
+
+
+def test_scripted_client_cycles_and_streams():
+    client = Swarm(
+        client=ScriptedClient(
+            [{"content": "", "tool_calls": [{"name": "ping", "args": {}}]}, {"content": "pong"}]
+        )
+    )
+    agent = Agent(functions=[lambda: "ok"])
+    agent.functions[0].__name__ = "ping"
+
+    response = client.run(agent=agent, messages=[])
+    events = list(client.run(agent=agent, messages=[], stream=True))
+
+    assert response.messages[-1]["content"] == "pong"
+    assert events[-1]["response"].messages[-1]["content"] == "pong"
+    assert client.client.requests == 4
+
+
+def test_suite_baseline_roundtrip(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    results = run_suite(filter="run[history=10]", min_time=0.01, verbose=False)
+    save_baseline(results, path)
+
+    assert [r.name for r in results] == ["run[history=10]"]
+    baseline = load_baseline(path)
+    slower = [r.model_copy(update={"us_per_turn": r.us_per_turn * 2}) for r in results]
+    assert all(regressed for _, _, regressed in compare(slower, baseline))
+    assert not any(regressed for _, _, regressed in compare(results, baseline))
+
+
+def test_cli_reports_regressions(tmp_path, capsys):
+    path = str(tmp_path / "baseline.json")
+    assert main(["-k", "merge_chunk[chunks=100]", "--min-time", "0.01", "--save", path]) == 0
+    assert "merge_chunk[chunks=100]" in capsys.readouterr().out
+    # with a negative threshold, any result counts as a regression
+    assert main(["-k", "merge_chunk[chunks=100]", "--min-time", "0.01",
+                 "--compare", path, "--threshold", "-1"]) == 1
+
+
+def test_latency_profile_stream_timing():
+    latency = LatencyProfile(ttft=0.05, inter_token=0.01, jitter=0.2, seed=1)
+    client = ScriptedClient([{"content": "x" * 20}], latency=latency)
+
+    start = time.perf_counter()
+    stream = client.create(stream=True)
+    first = next(stream)
+    first_at = time.perf_counter() - start
+    rest = list(stream)
+    total = time.perf_counter() - start
+
+    assert first.choices[0].delta.role == "assistant"
+    assert len(rest) == 5
+    assert 0.04 <= first_at < total
+    assert total >= 0.04 + 5 * 0.008
+
+
+def test_error_injection():
+    client = ScriptedClient([{"content": "hi"}], latency=LatencyProfile(error_rate=1))
+    with pytest.raises(openai.APIConnectionError):
+        client.create()
+
+    client = ScriptedClient(
+        [{"content": "x" * 40}], latency=LatencyProfile(stream_error_rate=1, seed=3)
+    )
+    received = []
+    with pytest.raises(openai.APIConnectionError):
+        for chunk in client.create(stream=True):
+            received.append(chunk)
+    assert 1 <= len(received) < 11
+
+
+def test_async_scripted_client_runs_concurrently():
+    calls = [{"name": "lookup", "args": {"query": "a" * 30}}]
+
+    def lookup(query):
+        return query
+
+    async def converse():
+        client = AsyncSwarm(
+            client=AsyncScriptedClient(
+                [{"content": "", "tool_calls": calls}, {"content": "done"}],
+                latency=LatencyProfile(ttft=0.05, inter_token=0.001),
+            )
+        )
+        stream = await client.run(agent=Agent(functions=[lookup]), messages=[], stream=True)
+        return [event async for event in stream]
+
+    async def main():
+        return await asyncio.gather(*[converse() for _ in range(10)])
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+
+    assert time.perf_counter() - start < 0.5
+    responses = [events[-1]["response"] for events in results]
+    assert all(r.messages[1]["content"] == "a" * 30 for r in responses)
+
+
+def test_load_run_against_example_graph():
+    agent = load_agent("examples/triage_agent/agents.py")
+    report = asyncio.run(
+        run_load(
+            agent,
+            users=20,
+            turns=3,
+            latency=LatencyProfile(ttft=0.01, inter_token=0.0005),
+            tool_rate=1,
+            seed=0,
+        )
+    )
+
+    assert agent.name == "Triage Agent"
+    assert (report.turns, report.errors) == (60, 0)
+    # every user turn calls a tool, then replies after its result
+    assert report.requests == 120
+    assert report.ttft["p50"] >= 10
+    assert report.turn_latency["p99"] >= report.turn_latency["p50"] >= report.ttft["p50"]
@@ -0,0 +1,84 @@
+from swarm import Swarm, Agent
+from swarm.cache import CompletionCache, request_key
+from tests.mock_client import MockOpenAIClient, create_mock_response, create_mock_stream
+
+MESSAGES = [{"role": "user", "content": "What's the weather in SF?"}]
+
+
+def make_client(cache):
+    mock = MockOpenAIClient()
+    mock.set_response(create_mock_response({"role": "assistant", "content": "Sunny"}))
+    return mock, Swarm(client=mock, cache=cache)
+
+
+def test_identical_requests_hit_cache():
+    mock, client = make_client(CompletionCache())
+
+    first = client.run(agent=Agent(), messages=MESSAGES)
+    second = client.run(agent=Agent(), messages=MESSAGES)
+    client.run(agent=Agent(), messages=[{"role": "user", "content": "other"}])
+
+    assert mock.chat.completions.create.call_count == 2
+    assert first.messages == second.messages
+    assert client.cache.hits == 1
+
+
+def test_sqlite_tier_persists(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    mock, client = make_client(CompletionCache(path=path))
+    client.run(agent=Agent(), messages=MESSAGES)
+
+    mock, client = make_client(CompletionCache(path=path))
+    response = client.run(agent=Agent(), messages=MESSAGES)
+
+    mock.chat.completions.create.assert_not_called()
+    assert response.messages[-1]["content"] == "Sunny"
+
+
+def test_stream_is_recorded_and_replayed():
+    cache = CompletionCache()
+    mock = MockOpenAIClient()
+    mock.set_response(
+        iter(
+            create_mock_stream(
+                {"role": "assistant", "content": "Sunny all day"},
+                [{"name": "get_weather", "args": {"location": "SF"}}],
+                usage={"prompt_tokens": 20, "completion_tokens": 8, "total_tokens": 28},
+            )
+        )
+    )
+    client = Swarm(client=mock, cache=cache)
+    agent = Agent()
+
+    streamed = list(
+        client.run(agent=agent, messages=MESSAGES, stream=True, execute_tools=False)
+    )
+    replayed = list(
+        client.run(agent=agent, messages=MESSAGES, stream=True, execute_tools=False)
+    )
+    response = client.run(agent=agent, messages=MESSAGES, execute_tools=False)
+
+    assert mock.chat.completions.create.call_count == 1
+    assert streamed[-1]["response"].messages == replayed[-1]["response"].messages
+    message = response.messages[-1]
+    assert message["content"] == "Sunny all day"
+    assert message["tool_calls"][0]["function"]["arguments"] == '{"location": "SF"}'
+    assert replayed[-1]["response"].usage.total_tokens == 28
+    assert response.usage.total_tokens == 28
+
+
+def test_lru_eviction():
+    cache = CompletionCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, {"completion": {}})
+
+    assert cache.get("a") is None
+    assert cache.get("c") == {"completion": {}}
+
+
+def test_request_key_ignores_stream_and_key_order():
+    params = {"model": "gpt-4o", "messages": MESSAGES, "tools": None, "stream": True}
+    reordered = {"stream": False, "tools": None, "messages": MESSAGES, "model": "gpt-4o"}
+
+    assert request_key(params) == request_key(reordered)
+    assert request_key(params) != request_key({**params, "model": "gpt-4o-mini"})
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+from swarm import Swarm, AsyncSwarm, Agent
+from swarm.cassette import AsyncCassette, Cassette
+from tests.mock_client import (
+    AsyncMockOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+MESSAGES = [{"role": "user", "content": "What's the weather in SF?"}]
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+
+    def get_weather(location):
+        return "Sunny"
+
+    agent = Agent(functions=[get_weather])
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                [{"name": "get_weather", "args": {"location": "SF"}}],
+            ),
+            create_mock_response({"role": "assistant", "content": "It's sunny."}),
+        ]
+    )
+    recorded = Swarm(client=Cassette(path, mode="record", client=mock)).run(
+        agent=agent, messages=MESSAGES
+    )
+
+    replayed = Swarm(client=Cassette(path)).run(agent=agent, messages=MESSAGES)
+
+    assert replayed.messages == recorded.messages
+    assert replayed.messages[-1]["content"] == "It's sunny."
+
+
+def test_stream_replay_at_recorded_speed(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+
+    def slow_stream():
+        for chunk in create_mock_stream({"role": "assistant", "content": "Hello there"}):
+            time.sleep(0.02)
+            yield chunk
+
+    mock = MockOpenAIClient()
+    mock.set_response(slow_stream())
+    list(
+        Swarm(client=Cassette(path, mode="record", client=mock)).run(
+            agent=Agent(), messages=MESSAGES, stream=True
+        )
+    )
+
+    start = time.perf_counter()
+    events = list(
+        Swarm(client=Cassette(path, realtime=True)).run(
+            agent=Agent(), messages=MESSAGES, stream=True
+        )
+    )
+    realtime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = list(Swarm(client=Cassette(path)).run(agent=Agent(), messages=MESSAGES, stream=True))
+    as_fast_as_possible = time.perf_counter() - start
+
+    assert events[-1]["response"].messages[-1]["content"] == "Hello there"
+    assert fast[-1]["response"].messages == events[-1]["response"].messages
+    assert realtime > 0.05 > as_fast_as_possible
+
+
+def test_async_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    mock = AsyncMockOpenAIClient()
+    mock.set_response(create_mock_response({"role": "assistant", "content": "Hi"}))
+
+    async def run(client):
+        return await AsyncSwarm(client=client).run(agent=Agent(), messages=MESSAGES)
+
+    asyncio.run(run(AsyncCassette(path, mode="record", client=mock)))
+    response = asyncio.run(run(AsyncCassette(path)))
+
+    assert response.messages[-1]["content"] == "Hi"
@@ -0,0 +1,235 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from swarm import AsyncSwarm, Swarm, Agent
+from swarm.types import Result
+from swarm.checkpoint import MemoryCheckpointStore, SQLiteCheckpointStore
+from tests.mock_client import AsyncMockOpenAIClient, MockOpenAIClient, create_mock_response
+
+
+class Crash(BaseException):
+    """Stands in for the process dying; tool errors are otherwise reported to the model."""
+
+
+calls = []
+
+
+def lookup(order: str):
+    calls.append(order)
+    if order == "crash" and calls.count("crash") == 1:
+        raise Crash()
+    return f"order {order} shipped"
+
+
+def remember():
+    calls.append("remember")
+    return Result(value="ok", context_variables={"seen": "yes"})
+
+
+def transfer_to_agent2():
+    return agent2
+
+
+agent1 = Agent(name="Agent 1", functions=[lookup, remember, transfer_to_agent2])
+agent2 = Agent(name="Agent 2")
+
+
+def tool_call(name, args):
+    return tool_calls((name, args))
+
+
+def tool_calls(*calls):
+    return create_mock_response(
+        {"role": "assistant", "content": ""}, [{"name": name, "args": args} for name, args in calls]
+    )
+
+
+def reply(content):
+    return create_mock_response({"role": "assistant", "content": content})
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCheckpointStore()
+    return SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+
+
+def test_resume_after_failed_completion(store):
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [tool_call("lookup", {"order": "42"}), tool_call("transfer_to_agent2", {}), RuntimeError("down")]
+    )
+    client = Swarm(client=mock, checkpoint_store=store)
+    messages = [{"role": "user", "content": "where is my order?"}]
+
+    with pytest.raises(RuntimeError):
+        client.run(agent=agent1, messages=messages, context_variables={"user": "ann"}, run_id="r1")
+
+    state = store.load("r1")
+    assert state.messages == messages
+    assert state.agent == "Agent 2"
+    assert state.turn == 2
+    assert state.context_variables == {"user": "ann"}
+    assert not state.pending_tool_calls and not state.done
+    assert store.unfinished() == ["r1"]
+
+    mock.chat.completions.create.reset_mock()
+    mock.set_sequential_responses([reply("it shipped")])
+    response = client.resume("r1", agents=[agent1, agent2])
+
+    assert calls == ["42"]
+    assert mock.chat.completions.create.call_count == 1
+    assert [m["role"] for m in response.messages] == ["assistant", "tool"] * 2 + ["assistant"]
+    assert response.messages[-1]["content"] == "it shipped"
+    assert response.agent.name == "Agent 2"
+    # finished runs are deleted
+    assert store.load("r1") is None
+    assert store.unfinished() == []
+
+
+def test_resume_runs_only_unfinished_tool_calls(store):
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [tool_calls(("remember", {}), ("transfer_to_agent2", {}), ("lookup", {"order": "crash"}))]
+    )
+    client = Swarm(client=mock, checkpoint_store=store)
+
+    with pytest.raises(Crash):
+        client.run(agent=agent1, messages=[{"role": "user", "content": "hi"}], run_id="r1")
+    state = store.load("r1")
+    assert [c["function"]["name"] for c in state.pending_tool_calls] == ["lookup"]
+    assert [m["role"] for m in state.new_messages] == ["assistant", "tool", "tool"]
+    assert state.tool_context_variables == {"seen": "yes"}
+    assert state.tool_handoff == "Agent 2"
+    assert state.agent == "Agent 1"
+
+    mock.chat.completions.create.reset_mock()
+    mock.set_sequential_responses([reply("done")])
+    response = client.resume("r1", agents=[agent1, agent2])
+
+    # only the interrupted call runs again, and no completion is requested again for it
+    assert calls == ["remember", "crash", "crash"]
+    assert mock.chat.completions.create.call_count == 1
+    assert [m.get("tool_name") for m in response.messages[1:4]] == [
+        "remember",
+        "transfer_to_agent2",
+        "lookup",
+    ]
+    assert response.messages[3]["content"] == "order crash shipped"
+    assert response.messages[-1]["content"] == "done"
+    assert response.agent.name == "Agent 2"
+    assert response.context_variables == {"seen": "yes"}
+
+
+class CrashingStore:
+    """Delegates to `store`, dying on its `crash_on`-th save."""
+
+    def __init__(self, store, crash_on):
+        self.store = store
+        self.crash_on = crash_on
+        self.saves = 0
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def save(self, state):
+        self.saves += 1
+        if self.saves == self.crash_on:
+            raise Crash()
+        self.store.save(state)
+
+
+def test_resume_applies_finished_batch_before_next_completion(store):
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [tool_calls(("remember", {}), ("transfer_to_agent2", {}))]
+    )
+    # saves: pending batch, each of the two results, then the end of the batch
+    client = Swarm(client=mock, checkpoint_store=CrashingStore(store, crash_on=4))
+
+    with pytest.raises(Crash):
+        client.run(agent=agent1, messages=[{"role": "user", "content": "hi"}], run_id="r1")
+    state = store.load("r1")
+    assert state.pending_tool_calls == []
+    assert (state.tool_context_variables, state.tool_handoff) == ({"seen": "yes"}, "Agent 2")
+
+    mock.chat.completions.create.reset_mock()
+    mock.set_sequential_responses([reply("done")])
+    response = Swarm(client=mock, checkpoint_store=store).resume("r1", agents=[agent1, agent2])
+
+    assert calls == ["remember"]
+    assert mock.chat.completions.create.call_count == 1
+    assert response.agent.name == "Agent 2"
+    assert response.context_variables == {"seen": "yes"}
+
+
+def test_keep_finished_runs(store):
+    store.keep_finished = True
+    mock = MockOpenAIClient()
+    mock.set_response(reply("hello"))
+    client = Swarm(client=mock, checkpoint_store=store)
+    first = client.run(agent=agent1, messages=[{"role": "user", "content": "hi"}], run_id="r1")
+
+    assert store.load("r1").done and store.unfinished() == []
+    response = client.resume("r1", agents=[agent1])
+
+    assert response.messages == first.messages
+    assert mock.chat.completions.create.call_count == 1
+
+
+def test_resume_errors():
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses([tool_call("transfer_to_agent2", {}), RuntimeError("down")])
+    client = Swarm(client=mock, checkpoint_store=MemoryCheckpointStore())
+    with pytest.raises(RuntimeError):
+        client.run(agent=agent1, messages=[{"role": "user", "content": "hi"}], run_id="r1")
+
+    with pytest.raises(ValueError, match="Agent 2"):
+        client.resume("r1", agents=[agent1])
+    with pytest.raises(KeyError):
+        client.resume("missing", agents=[agent1])
+    with pytest.raises(ValueError, match="checkpoint_store"):
+        Swarm(client=mock).resume("r1", agents=[agent1])
+
+
+def test_async_resume_with_concurrent_tools():
+    mock = AsyncMockOpenAIClient()
+    mock.set_sequential_responses(
+        [tool_calls(("lookup", {"order": "7"}), ("lookup", {"order": "crash"}))]
+    )
+    store = MemoryCheckpointStore()
+    client = AsyncSwarm(client=mock, checkpoint_store=store, concurrent_tools=True)
+
+    with pytest.raises(Crash):
+        asyncio.run(client.run(agent=agent1, messages=[{"role": "user", "content": "hi"}], run_id="r1"))
+    assert len(store.load("r1").pending_tool_calls) == 1
+
+    mock.set_sequential_responses([reply("shipped")])
+    response = asyncio.run(client.resume("r1", agents=[agent1]))
+
+    assert calls.count("7") == 1 and calls.count("crash") == 2
+    assert [m["content"] for m in response.messages[1:3]] == [
+        "order 7 shipped",
+        "order crash shipped",
+    ]
+    assert response.messages[-1]["content"] == "shipped"
+
+
+def test_values_that_do_not_round_trip_fail_loudly(store):
+    mock = MockOpenAIClient()
+    mock.set_response(reply("hello"))
+    client = Swarm(client=mock, checkpoint_store=store)
+
+    with pytest.raises(TypeError, match="context_variables"):
+        client.run(agent=agent1, messages=[], context_variables={"since": date(2024, 1, 1)}, run_id="r1")
+
+    assert mock.chat.completions.create.call_count == 0
+    assert store.load("r1") is None
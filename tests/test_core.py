@@ -1,7 +1,19 @@
+import asyncio
+import gc
+import time
+import weakref
 import pytest
-from swarm import Swarm, Agent
-from tests.mock_client import MockOpenAIClient, create_mock_response
-from unittest.mock import Mock
+from swarm import Swarm, AsyncSwarm, Agent
+from swarm.history import LastNTurns
+from swarm.types import Result
+from swarm.util import function_to_json
+from tests.mock_client import (
+    AsyncMockOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+from unittest.mock import Mock, patch
 import json
 
 DEFAULT_RESPONSE_CONTENT = "sample response content"
@@ -16,6 +28,15 @@ def mock_openai_client():
     return m
 
 
+@pytest.fixture
+def async_mock_openai_client():
+    m = AsyncMockOpenAIClient()
+    m.set_response(
+        create_mock_response({"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT})
+    )
+    return m
+
+
 def test_run_with_simple_message(mock_openai_client: MockOpenAIClient):
     agent = Agent()
     # set up client and run
@@ -143,3 +164,397 @@ def test_handoff(mock_openai_client: MockOpenAIClient):
     assert response.agent == agent2
     assert response.messages[-1]["role"] == "assistant"
     assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_async_run_with_simple_message(
+    async_mock_openai_client: AsyncMockOpenAIClient,
+):
+    agent = Agent()
+    # set up client and run
+    client = AsyncSwarm(client=async_mock_openai_client)
+    messages = [{"role": "user", "content": "Hello, how are you?"}]
+    response = asyncio.run(client.run(agent=agent, messages=messages))
+
+    # assert response content
+    assert response.messages[-1]["role"] == "assistant"
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_async_handoff_and_context_variables(
+    async_mock_openai_client: AsyncMockOpenAIClient,
+):
+    def transfer_to_agent2(context_variables):
+        return Result(
+            value="Done", agent=agent2, context_variables={"user": "Ilan"}
+        )
+
+    agent1 = Agent(name="Test Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Test Agent 2")
+
+    # set mock to return a response that triggers the handoff
+    async_mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "transfer_to_agent2"}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    # set up client and run
+    client = AsyncSwarm(client=async_mock_openai_client)
+    messages = [{"role": "user", "content": "I want to talk to agent 2"}]
+    response = asyncio.run(client.run(agent=agent1, messages=messages))
+
+    assert response.agent == agent2
+    assert response.context_variables == {"user": "Ilan"}
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_concurrent_tool_calls(mock_openai_client: MockOpenAIClient):
+    def slow_tool(name, delay):
+        def tool(context_variables):
+            time.sleep(delay)
+            return Result(value=name, context_variables={"last": name, name: True})
+
+        tool.__name__ = name
+        return tool
+
+    # the slowest tool finishes first in the list, but must still merge first
+    tools = [slow_tool("a", 0.3), slow_tool("b", 0.2), slow_tool("c", 0.1)]
+    agent = Agent(name="Test Agent", functions=tools)
+
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "a"}, {"name": "b"}, {"name": "c"}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client, concurrent_tools=True)
+    start = time.perf_counter()
+    response = client.run(agent=agent, messages=[{"role": "user", "content": "hi"}])
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    tool_messages = [m for m in response.messages if m["role"] == "tool"]
+    assert [m["content"] for m in tool_messages] == ["a", "b", "c"]
+    assert response.context_variables == {"last": "c", "a": True, "b": True, "c": True}
+
+
+def test_coroutine_tool_call(mock_openai_client: MockOpenAIClient):
+    async def get_weather(location, context_variables):
+        await asyncio.sleep(0)
+        return Result(value=f"Sunny in {location}", context_variables={"checked": True})
+
+    agent = Agent(name="Test Agent", functions=[get_weather])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "get_weather", "args": {"location": "SF"}}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client)
+    response = client.run(agent=agent, messages=[{"role": "user", "content": "hi"}])
+
+    assert response.messages[1]["content"] == "Sunny in SF"
+    assert response.context_variables == {"checked": True}
+
+
+def test_async_concurrent_coroutine_tool_calls(
+    async_mock_openai_client: AsyncMockOpenAIClient,
+):
+    async def lookup_a():
+        await asyncio.sleep(0.2)
+        return "a"
+
+    async def lookup_b():
+        await asyncio.sleep(0.2)
+        return "b"
+
+    def lookup_c():
+        time.sleep(0.2)
+        return "c"
+
+    agent = Agent(name="Test Agent", functions=[lookup_a, lookup_b, lookup_c])
+    async_mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "lookup_a"},
+                    {"name": "lookup_b"},
+                    {"name": "lookup_c"},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=async_mock_openai_client, concurrent_tools=True)
+    start = time.perf_counter()
+    response = asyncio.run(
+        client.run(agent=agent, messages=[{"role": "user", "content": "hi"}])
+    )
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.4
+    tool_messages = [m for m in response.messages if m["role"] == "tool"]
+    assert [m["content"] for m in tool_messages] == ["a", "b", "c"]
+
+
+def test_run_many(mock_openai_client: MockOpenAIClient):
+    def create(**kwargs):
+        content = kwargs["messages"][-1]["content"]
+        if content == "fail":
+            raise RuntimeError("boom")
+        return create_mock_response({"role": "assistant", "content": content.upper()})
+
+    mock_openai_client.chat.completions.create.side_effect = create
+    agent = Agent()
+    jobs = [
+        (agent, [{"role": "user", "content": "hello"}]),
+        (agent, [{"role": "user", "content": "fail"}], {"user": "Ilan"}),
+        (agent, [{"role": "user", "content": "bye"}], {"user": "James"}),
+    ]
+
+    client = Swarm(client=mock_openai_client)
+    results = sorted(client.run_many(jobs, max_concurrency=2), key=lambda r: r.index)
+
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].response.messages[-1]["content"] == "HELLO"
+    assert isinstance(results[1].error, RuntimeError) and results[1].response is None
+    assert results[2].response.context_variables == {"user": "James"}
+
+
+def test_async_run_many(async_mock_openai_client: AsyncMockOpenAIClient):
+    agent = Agent()
+    jobs = ((agent, [{"role": "user", "content": str(i)}]) for i in range(5))
+
+    async def collect():
+        client = AsyncSwarm(client=async_mock_openai_client)
+        return [result async for result in client.run_many(jobs, max_concurrency=2)]
+
+    results = asyncio.run(collect())
+
+    assert sorted(r.index for r in results) == [0, 1, 2, 3, 4]
+    assert all(r.error is None for r in results)
+    assert all(
+        r.response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT for r in results
+    )
+
+
+def test_tool_schemas_are_compiled_once(mock_openai_client: MockOpenAIClient):
+    def lookup(query, context_variables):
+        return "found"
+
+    def other(query):
+        return "other"
+
+    agent = Agent(functions=[lookup])
+    client = Swarm(client=mock_openai_client)
+    messages = [{"role": "user", "content": "hi"}]
+
+    with patch("swarm.core.function_to_json", wraps=function_to_json) as to_json:
+        client.run(agent=agent, messages=messages)
+        client.run(agent=agent, messages=messages)
+        assert to_json.call_count == 1
+
+        # changing the functions list invalidates the agent's payload
+        agent.functions.append(other)
+        client.run(agent=agent, messages=messages)
+        assert to_json.call_count == 2
+
+    tools = mock_openai_client.chat.completions.create.call_args.kwargs["tools"]
+    assert [t["function"]["name"] for t in tools] == ["lookup", "other"]
+    assert tools[0]["function"]["parameters"]["properties"] == {
+        "query": {"type": "string"}
+    }
+    assert tools[0]["function"]["parameters"]["required"] == ["query"]
+    # the cached payload lives outside the model
+    assert agent == Agent(functions=[lookup, other])
+
+
+def test_tool_schema_cache_does_not_keep_agents_or_functions_alive(
+    mock_openai_client: MockOpenAIClient,
+):
+    def lookup(query):
+        return "found"
+
+    agent = Agent(functions=[lookup])
+    Swarm(client=mock_openai_client).run(agent=agent, messages=[])
+    refs = [weakref.ref(agent), weakref.ref(lookup)]
+    del agent, lookup
+    gc.collect()
+
+    assert [ref() for ref in refs] == [None, None]
+
+
+def test_run_does_not_modify_inputs(mock_openai_client: MockOpenAIClient):
+    def update_context(context_variables):
+        return Result(value="Done", context_variables={"user": "James"})
+
+    agent = Agent(functions=[update_context])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "update_context"}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+    messages = [{"role": "user", "content": "hi"}]
+    context_variables = {"user": "Ilan"}
+
+    client = Swarm(client=mock_openai_client)
+    response = client.run(
+        agent=agent, messages=messages, context_variables=context_variables
+    )
+
+    assert messages == [{"role": "user", "content": "hi"}]
+    assert context_variables == {"user": "Ilan"}
+    assert response.context_variables == {"user": "James"}
+    assert len(response.messages) == 3
+
+
+def test_speculative_tool_dispatch(mock_openai_client: MockOpenAIClient):
+    started = {}
+
+    def lookup(query):
+        started[query] = time.perf_counter()
+        return query.upper()
+
+    def slow_stream(chunks, pause_after):
+        for i, chunk in enumerate(chunks):
+            yield chunk
+            if i == pause_after:
+                time.sleep(0.2)
+
+    chunks = create_mock_stream(
+        {"role": "assistant", "content": ""},
+        [{"name": "lookup", "args": {"query": "a"}}, {"name": "lookup", "args": {"query": "b"}}],
+    )
+    # pause right after the first tool call's arguments are complete
+    first_done = next(
+        i for i, c in enumerate(chunks)
+        if c.choices[0].delta.tool_calls and c.choices[0].delta.tool_calls[0].index == 1
+    ) - 1
+    mock_openai_client.set_sequential_responses(
+        [
+            slow_stream(chunks, first_done),
+            iter(create_mock_stream({"role": "assistant", "content": "done"})),
+        ]
+    )
+
+    agent = Agent(functions=[lookup])
+    client = Swarm(client=mock_openai_client)
+    stream = client.run(
+        agent=agent,
+        messages=[{"role": "user", "content": "hi"}],
+        stream=True,
+        speculative_tools=True,
+    )
+    stream_ended = None
+    for event in stream:
+        if event.get("delim") == "end" and stream_ended is None:
+            stream_ended = time.perf_counter()
+        if "response" in event:
+            response = event["response"]
+
+    assert started["a"] < stream_ended
+    assert [m["content"] for m in response.messages if m["role"] == "tool"] == ["A", "B"]
+    assert response.messages[-1]["content"] == "done"
+
+
+def test_history_policy(mock_openai_client: MockOpenAIClient):
+    messages = [
+        {"role": "user", "content": "one"},
+        {"role": "assistant", "content": "two"},
+        {"role": "user", "content": "three"},
+    ]
+
+    client = Swarm(client=mock_openai_client)
+    response = client.run(
+        agent=Agent(), messages=messages, history_policy=LastNTurns(1)
+    )
+
+    sent = mock_openai_client.chat.completions.create.call_args.kwargs["messages"]
+    assert [m["content"] for m in sent[1:]] == ["three"]
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_usage_per_agent(mock_openai_client: MockOpenAIClient):
+    def transfer_to_agent2():
+        return agent2
+
+    agent1 = Agent(name="Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Agent 2")
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                [{"name": "transfer_to_agent2"}],
+                usage={"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110},
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": "Hi"},
+                usage={
+                    "prompt_tokens": 120,
+                    "completion_tokens": 5,
+                    "total_tokens": 125,
+                    "prompt_tokens_details": {"cached_tokens": 100},
+                },
+            ),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client)
+    response = client.run(agent=agent1, messages=[{"role": "user", "content": "hi"}])
+
+    usage = response.usage
+    assert (usage.requests, usage.prompt_tokens, usage.completion_tokens) == (2, 220, 15)
+    assert (usage.cached_tokens, usage.total_tokens) == (100, 235)
+    assert usage.agents["Agent 1"].total_tokens == 110
+    assert usage.agents["Agent 2"].cached_tokens == 100
+    assert usage.cost(2.5, 10, cached_input_per_million=1.25) == pytest.approx(
+        (120 * 2.5 + 100 * 1.25 + 15 * 10) / 1e6
+    )
+
+
+def test_stream_usage_event(mock_openai_client: MockOpenAIClient):
+    mock_openai_client.set_response(
+        iter(
+            create_mock_stream(
+                {"role": "assistant", "content": "Hello there"},
+                usage={"prompt_tokens": 12, "completion_tokens": 3, "total_tokens": 15},
+            )
+        )
+    )
+
+    client = Swarm(client=mock_openai_client)
+    events = list(client.run(agent=Agent(), messages=[], stream=True))
+
+    params = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert params["stream_options"] == {"include_usage": True}
+    assert events[-2] == {"usage": events[-1]["response"].usage}
+    assert events[-2]["usage"].total_tokens == 15
+    assert events[-1]["response"].messages[-1]["content"] == "Hello there"
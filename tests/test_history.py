@@ -0,0 +1,68 @@
+from swarm.history import History, LastNTurns, TokenBudget, estimate_tokens
+
+
+def test_history_shares_base_messages():
+    messages = [{"role": "user", "content": "hi"}]
+    history = History(messages)
+    history.append({"role": "assistant", "content": "hello"})
+    history.extend([{"role": "user", "content": "bye"}])
+
+    assert len(history) == 3
+    assert history[0] is messages[0]
+    assert history[-1]["content"] == "bye"
+    assert [m["content"] for m in history] == ["hi", "hello", "bye"]
+    assert [m["content"] for m in history[1:]] == ["hello", "bye"]
+    assert [m["content"] for m in history.new] == ["hello", "bye"]
+    # the caller's list is never modified
+    assert messages == [{"role": "user", "content": "hi"}]
+
+
+def test_history_ignores_later_caller_appends():
+    messages = [{"role": "user", "content": "hi"}]
+    history = History(messages)
+    messages.append({"role": "user", "content": "late"})
+    history.append({"role": "assistant", "content": "hello"})
+
+    assert [m["content"] for m in history] == ["hi", "hello"]
+
+
+def test_history_concatenation():
+    history = History([{"role": "user", "content": "hi"}])
+    system = {"role": "system", "content": "sys"}
+
+    assert [system] + history == [system, {"role": "user", "content": "hi"}]
+
+
+CONVERSATION = [
+    {"role": "user", "content": "first question"},
+    {"role": "assistant", "content": "first answer"},
+    {"role": "user", "content": "look it up"},
+    {
+        "role": "assistant",
+        "content": "",
+        "tool_calls": [{"id": "1", "function": {"name": "lookup", "arguments": "{}"}}],
+    },
+    {"role": "tool", "tool_call_id": "1", "content": "x" * 400},
+    {"role": "assistant", "content": "here it is"},
+]
+
+
+def test_last_n_turns():
+    assert LastNTurns(1)(CONVERSATION) == CONVERSATION[2:]
+    assert LastNTurns(2)(CONVERSATION) == CONVERSATION
+    assert LastNTurns(5)(History(CONVERSATION)) == CONVERSATION
+
+
+def test_token_budget_keeps_tool_pairs():
+    # the budget fits the final message and the tool result, but not the call
+    budget = estimate_tokens(CONVERSATION[-1]) + estimate_tokens(CONVERSATION[-2])
+    assert TokenBudget(budget)(CONVERSATION) == CONVERSATION[-1:]
+
+    # with room for the call, the pair is kept together
+    budget += estimate_tokens(CONVERSATION[3])
+    assert TokenBudget(budget)(CONVERSATION) == CONVERSATION[3:]
+
+
+def test_token_budget_always_keeps_newest_message():
+    assert TokenBudget(0)(CONVERSATION) == CONVERSATION[-1:]
+    assert TokenBudget(10_000)(CONVERSATION) == CONVERSATION
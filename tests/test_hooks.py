@@ -0,0 +1,112 @@
+import asyncio
+
+from swarm import AsyncSwarm, Swarm, Agent
+from swarm.hooks import RunHooks
+from tests.mock_client import AsyncMockOpenAIClient, MockOpenAIClient, create_mock_response, create_mock_stream
+
+
+class RecordingHooks(RunHooks):
+    def __init__(self):
+        self.events = []
+        for name in dir(RunHooks):
+            if name.startswith("on_"):
+                setattr(self, name, self.events.append)
+
+
+def test_lifecycle_events():
+    def transfer_to_agent2():
+        return agent2
+
+    agent1 = Agent(name="Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Agent 2", model="gpt-4o-mini")
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""}, [{"name": "transfer_to_agent2"}]
+            ),
+            create_mock_response({"role": "assistant", "content": "Hi from agent 2"}),
+        ]
+    )
+    hooks = RecordingHooks()
+    client = Swarm(client=mock, hooks=[hooks])
+
+    client.run(agent=agent1, messages=[{"role": "user", "content": "hi"}])
+
+    events = hooks.events
+    assert [e.name for e in events] == [
+        "on_run_start",
+        "on_turn_start",
+        "on_llm_request",
+        "on_llm_end",
+        "on_tool_start",
+        "on_tool_end",
+        "on_handoff",
+        "on_turn_start",
+        "on_llm_request",
+        "on_llm_end",
+        "on_run_end",
+    ]
+    assert len({e.run_id for e in events}) == 1
+    timestamps = [e.timestamp for e in events]
+    assert timestamps == sorted(timestamps)
+    tool_end = events[5]
+    assert (tool_end.agent, tool_end.tool, tool_end.turn) == ("Agent 1", "transfer_to_agent2", 1)
+    assert tool_end.data["handoff"] == "Agent 2"
+    assert events[6].data == {"to": "Agent 2"}
+    assert (events[8].agent, events[8].model, events[8].message_count) == ("Agent 2", "gpt-4o-mini", 3)
+    assert events[-1].message_count == 4
+
+
+def test_stream_first_token_and_tool_error():
+    def broken():
+        raise RuntimeError("boom")
+
+    mock = MockOpenAIClient()
+    mock.set_response(
+        iter(create_mock_stream({"role": "assistant", "content": ""}, [{"name": "broken"}]))
+    )
+    hooks = RecordingHooks()
+    client = Swarm(client=mock, hooks=[hooks])
+
+    try:
+        list(client.run(agent=Agent(functions=[broken]), messages=[], stream=True))
+    except RuntimeError:
+        pass
+
+    names = [e.name for e in hooks.events]
+    assert names.index("on_first_token") == names.index("on_llm_request") + 1
+    tool_end = next(e for e in hooks.events if e.name == "on_tool_end")
+    assert isinstance(tool_end.data["error"], RuntimeError)
+    assert isinstance(hooks.events[-1].data["error"], RuntimeError)
+
+
+def test_closing_a_stream_early_ends_the_run():
+    mock = MockOpenAIClient()
+    mock.set_response(create_mock_stream({"role": "assistant", "content": "Hello there"}))
+    hooks = RecordingHooks()
+    client = Swarm(client=mock, hooks=[hooks])
+
+    stream = client.run(agent=Agent(), messages=[], stream=True)
+    assert next(stream) == {"delim": "start"}
+    stream.close()
+
+    assert hooks.events[-1].name == "on_run_end"
+    assert hooks.events[-1].data == {"closed": True}
+
+
+def test_closing_an_async_stream_early_ends_the_run():
+    mock = AsyncMockOpenAIClient()
+    mock.set_response(create_mock_stream({"role": "assistant", "content": "Hello there"}))
+    hooks = RecordingHooks()
+    client = AsyncSwarm(client=mock, hooks=[hooks])
+
+    async def consume():
+        stream = await client.run(agent=Agent(), messages=[], stream=True)
+        assert await stream.__anext__() == {"delim": "start"}
+        await stream.aclose()
+
+    asyncio.run(consume())
+
+    assert hooks.events[-1].name == "on_run_end"
+    assert hooks.events[-1].data == {"closed": True}
@@ -0,0 +1,86 @@
+import io
+import json
+import logging
+
+import pytest
+
+from swarm import Swarm, Agent
+from swarm.log import MAX_PAYLOAD_CHARS, Payload, configure_logging, log, logger
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+@pytest.fixture
+def json_logs():
+    stream = io.StringIO()
+    listener = configure_logging(logging.DEBUG, stream=stream)
+
+    def records():
+        listener.stop()  # writes out everything queued so far
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield records
+    listener.stop()
+    logger.handlers = logger.handlers[:1]
+    logger.setLevel(logging.NOTSET)
+
+
+def test_run_logs_structured_records(json_logs):
+    mock = MockOpenAIClient()
+    mock.set_response(create_mock_response({"role": "assistant", "content": "hi"}))
+    history = [{"role": "user", "content": f"message {i}"} for i in range(100)]
+
+    Swarm(client=mock).run(agent=Agent(), messages=history)
+
+    records = json_logs()
+    first = records[0]
+    assert first["level"] == "DEBUG"
+    assert first["message"] == "Getting chat completion for..."
+    assert first["messages"][0] == "... 96 earlier items"
+    assert first["messages"][-1] == {"role": "user", "content": "message 99"}
+    assert records[1]["completion"]["content"] == "hi"
+
+
+def test_disabled_logging_renders_nothing():
+    rendered = []
+    log(False, logging.DEBUG, "expensive", payload=lambda: rendered.append(1))
+    assert rendered == []
+
+
+def test_payload_is_capped_and_snapshots_lists():
+    items = ["x"]
+    payload = Payload(items)
+    items.append("y")
+    assert payload.render() == ["x"]
+    long = Payload("a" * (MAX_PAYLOAD_CHARS * 2)).render()
+    assert len(long) < MAX_PAYLOAD_CHARS + 50
+    assert long.endswith(f"({MAX_PAYLOAD_CHARS} more chars)")
+
+
+def test_logged_arguments_are_snapshots(json_logs):
+    def lookup(order, context_variables):
+        return "shipped"
+
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""}, [{"name": "lookup", "args": {"order": "1"}}]
+            ),
+            create_mock_response({"role": "assistant", "content": "done"}),
+        ]
+    )
+
+    Swarm(client=mock).run(
+        agent=Agent(functions=[lookup]), messages=[], context_variables={"api_token": "SECRET"}
+    )
+
+    (record,) = [r for r in json_logs() if r["message"] == "Processing tool call"]
+    assert record["arguments"] == {"order": "1"}
+
+
+def test_payload_snapshots_dicts():
+    fields = {"nested": {"a": 1}}
+    payload = Payload(fields)
+    fields["added"] = True
+    fields["nested"]["b"] = 2
+    assert payload.render() == {"nested": {"a": 1}}
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from swarm import Agent, Swarm, AsyncSwarm
+from swarm.pool import pool_stats, pooled_client
+
+
+def test_pooled_client_is_shared_per_configuration():
+    first = pooled_client(api_key="test", max_connections=7)
+    second = pooled_client(api_key="test", max_connections=7)
+    other = pooled_client(api_key="test", max_connections=8)
+
+    assert first is second
+    assert first is not other
+    assert Swarm.pooled(api_key="test", max_connections=7).client is first
+    assert AsyncSwarm.pooled(api_key="test", max_connections=7).client is not first
+
+
+def test_pooled_client_accepts_unhashable_arguments():
+    def client(user):
+        return pooled_client(
+            api_key="test", default_headers={"X-User": user}, timeout=httpx.Timeout(5.0)
+        )
+
+    assert client("ann") is client("ann")
+    assert client("ann") is not client("bob")
+    assert client("ann").default_headers["X-User"] == "ann"
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_pool_stats_track_requests():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    try:
+        client = pooled_client(api_key="test", max_connections=3)
+        http = httpx.Client(transport=client._swarm_transport)
+
+        response = http.send(http.build_request("GET", url), stream=True)
+        during = pool_stats(client)
+        response.close()
+        http.get(url)
+        after = pool_stats(client)
+    finally:
+        server.shutdown()
+
+    assert during.requests == 1 and during.in_use == 1
+    assert after.requests == 2 and after.in_use == 0
+    assert after.max_in_use == 1
+    # the second request reused the kept-alive connection
+    assert after.open_connections == 1 and after.idle_connections == 1
+    assert after.total_wait >= after.max_wait > 0
+    assert pool_stats(object()) is None
+
+
+class ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "pong"},
+                    }
+                ],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_async_pooled_client_over_the_network():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    client = AsyncSwarm.pooled(api_key="test", base_url=url, max_retries=0)
+    agent = Agent()
+
+    try:
+        # one event loop per call, as with asyncio.run per request
+        responses = [
+            asyncio.run(client.run(agent=agent, messages=[{"role": "user", "content": "ping"}]))
+            for _ in range(2)
+        ]
+    finally:
+        server.shutdown()
+
+    assert [r.messages[-1]["content"] for r in responses] == ["pong", "pong"]
+    stats = client.pool_stats()
+    assert stats.requests == 2 and stats.in_use == 0
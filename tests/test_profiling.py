@@ -0,0 +1,75 @@
+import gc
+import json
+import threading
+import time
+
+from swarm import Swarm, Agent
+from swarm.bench import LatencyProfile, ScriptedClient
+from swarm.hooks import HookEvent
+from swarm.profiling import RunProfiler
+
+
+def slow_lookup(query):
+    time.sleep(0.1)
+    return query
+
+
+def test_profile_phases_and_stacks(tmp_path):
+    client = Swarm(
+        client=ScriptedClient(
+            [
+                {"content": "", "tool_calls": [{"name": "slow_lookup", "args": {"query": "a"}}]},
+                {"content": "done"},
+            ],
+            latency=LatencyProfile(ttft=0.05),
+        )
+    )
+    path = tmp_path / "run.folded"
+
+    client.run(agent=Agent(functions=[slow_lookup]), messages=[], profile=str(path))
+
+    phases = json.loads((tmp_path / "run.phases.json").read_text())
+    assert 0.09 <= phases["llm_wait"] < 0.2
+    assert 0.09 <= phases["tool_execution"] < 0.2
+    assert 0 <= phases["swarm"] < phases["total"]
+    lines = path.read_text().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("slow_lookup" in line for line in lines)
+
+
+def test_profile_is_scoped_to_one_run():
+    client = Swarm(client=ScriptedClient([{"content": "hi"}]))
+    profiler = RunProfiler(interval=0.0005)
+
+    client.run(agent=Agent(), messages=[], profile=profiler)
+    client.run(agent=Agent(), messages=[])
+
+    assert profiler.phases["total"] > 0
+    assert client.hooks == []
+
+
+def start_event():
+    return HookEvent(name="on_run_start", run_id="r1", timestamp=time.monotonic())
+
+
+def test_sampler_stops_when_profiler_is_collected():
+    # a run that never reaches on_run_end must not leave the sampler behind
+    profiler = RunProfiler(interval=0.001)
+    profiler.on_run_start(start_event())
+    sampler = profiler._sampler
+
+    del profiler
+    gc.collect()
+
+    sampler.join(timeout=2)
+    assert not sampler.is_alive()
+
+
+def test_sampler_stops_with_its_thread():
+    profiler = RunProfiler(interval=0.001)
+    worker = threading.Thread(target=profiler.on_run_start, args=(start_event(),))
+    worker.start()
+    worker.join()
+
+    profiler._sampler.join(timeout=2)
+    assert not profiler._sampler.is_alive()
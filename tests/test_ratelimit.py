@@ -0,0 +1,66 @@
+import subprocess
+import sys
+
+import pytest
+
+from swarm import Swarm, Agent
+from swarm.ratelimit import FileBackend, RateLimiter
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def test_request_bucket():
+    limiter = RateLimiter(requests_per_minute=2)
+
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() == pytest.approx(30, abs=0.1)
+
+
+def test_token_bucket_takes_nothing_when_waiting():
+    limiter = RateLimiter(requests_per_minute=10, tokens_per_minute=100)
+
+    assert limiter.try_acquire(80) == 0
+    assert limiter.try_acquire(50) == pytest.approx(18, abs=0.1)
+    # the failed attempt did not consume a request or any tokens
+    assert limiter.try_acquire(20) == 0
+    # requests larger than the quota wait for a full bucket instead of forever
+    assert limiter.try_acquire(1000) == pytest.approx(60, abs=0.1)
+
+
+def test_file_backend_is_shared(tmp_path):
+    path = str(tmp_path / "ratelimit.json")
+    first = RateLimiter(requests_per_minute=1, backend=FileBackend(path))
+    second = RateLimiter(requests_per_minute=1, backend=FileBackend(path))
+
+    assert first.try_acquire() == 0
+    assert second.try_acquire() > 0
+
+
+def test_swarm_consults_rate_limiter():
+    mock = MockOpenAIClient()
+    mock.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=10_000)
+    client = Swarm(client=mock, rate_limiter=limiter)
+
+    client.run(agent=Agent(), messages=[{"role": "user", "content": "hi"}])
+    client.run(agent=Agent(), messages=[{"role": "user", "content": "hi"}])
+
+    assert limiter.try_acquire() > 0
+
+
+def test_import_without_fcntl():
+    # as on Windows: only FileBackend needs POSIX file locks
+    code = (
+        "import sys; sys.modules['fcntl'] = None\n"
+        "import swarm\n"
+        "from swarm.ratelimit import FileBackend, RateLimiter\n"
+        "RateLimiter(60).try_acquire()\n"
+        "try:\n"
+        "    FileBackend('limits.json')\n"
+        "except RuntimeError:\n"
+        "    print('unsupported')\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "unsupported"
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import openai
+import pytest
+
+from swarm import Swarm, AsyncSwarm, Agent
+from swarm.resilience import HedgePolicy, RetryPolicy
+from tests.mock_client import (
+    AsyncMockOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+)
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def rate_limit_error(retry_after=None):
+    headers = {"retry-after": retry_after} if retry_after else {}
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def test_retry_on_rate_limit():
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [
+            rate_limit_error(),
+            rate_limit_error(),
+            create_mock_response({"role": "assistant", "content": "ok"}),
+        ]
+    )
+    client = Swarm(client=mock, retry=RetryPolicy(initial_delay=0.001))
+
+    response = client.run(agent=Agent(), messages=MESSAGES)
+
+    assert mock.chat.completions.create.call_count == 3
+    assert response.messages[-1]["content"] == "ok"
+
+
+def test_retry_gives_up_and_skips_other_errors():
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses([rate_limit_error()] * 3)
+    client = Swarm(client=mock, retry=RetryPolicy(max_retries=2, initial_delay=0.001))
+    with pytest.raises(openai.RateLimitError):
+        client.run(agent=Agent(), messages=MESSAGES)
+    assert mock.chat.completions.create.call_count == 3
+
+    mock.set_sequential_responses([ValueError("bad request")])
+    with pytest.raises(ValueError):
+        client.run(agent=Agent(), messages=MESSAGES)
+
+
+def test_retry_delay_honours_retry_after():
+    policy = RetryPolicy(initial_delay=0.1, max_delay=5, jitter=False)
+
+    assert policy.delay(0) == 0.1
+    assert policy.delay(2) == pytest.approx(0.4)
+    assert policy.delay(0, rate_limit_error("3")) == 3
+    assert policy.delay(0, rate_limit_error("60")) == 5
+
+
+def test_hedged_request_takes_fastest_response():
+    calls = []
+
+    def create(**kwargs):
+        calls.append(time.perf_counter())
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return create_mock_response({"role": "assistant", "content": "slow"})
+        return create_mock_response({"role": "assistant", "content": "fast"})
+
+    mock = MockOpenAIClient()
+    mock.chat.completions.create.side_effect = create
+    hedge = HedgePolicy(initial_threshold=0.05)
+    client = Swarm(client=mock, hedge=hedge)
+
+    start = time.perf_counter()
+    response = client.run(agent=Agent(), messages=MESSAGES)
+
+    assert time.perf_counter() - start < 0.4
+    assert response.messages[-1]["content"] == "fast"
+    assert hedge.hedged == 1
+
+
+def test_hedge_records_the_winning_attempt_latency():
+    calls = []
+
+    def create():
+        calls.append(1)
+        time.sleep(0.3 if len(calls) == 1 else 0)
+        return len(calls)
+
+    hedge = HedgePolicy(initial_threshold=0.05)
+    assert hedge.call(create) == 2
+    assert hedge._latencies[0] < 0.05
+
+
+def test_concurrent_requests_do_not_queue_behind_each_other():
+    hedge = HedgePolicy(initial_threshold=0.5)
+
+    def create():
+        time.sleep(0.3)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=hedge.call, args=(create,)) for _ in range(80)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.perf_counter() - start < 0.5
+    assert hedge.hedged == 0
+    assert max(hedge._latencies) < 0.45
+
+
+def test_hedge_threshold_tracks_quantile():
+    hedge = HedgePolicy(quantile=0.9, initial_threshold=1.0, min_samples=10)
+    assert hedge.threshold() == 1.0
+
+    for latency in range(1, 11):
+        hedge.observe(latency / 10)
+    assert hedge.threshold() == 1.0
+    hedge.observe(0.1)
+    assert hedge.threshold() == pytest.approx(0.9)
+
+
+def test_async_hedged_request():
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.5)
+            return create_mock_response({"role": "assistant", "content": "slow"})
+        return create_mock_response({"role": "assistant", "content": "fast"})
+
+    mock = AsyncMockOpenAIClient()
+    mock.chat.completions.create.side_effect = create
+    client = AsyncSwarm(
+        client=mock,
+        retry=RetryPolicy(initial_delay=0.001),
+        hedge=HedgePolicy(initial_threshold=0.05),
+    )
+
+    response = asyncio.run(client.run(agent=Agent(), messages=MESSAGES))
+
+    assert response.messages[-1]["content"] == "fast"
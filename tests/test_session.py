@@ -0,0 +1,110 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from swarm import AsyncSwarm, Swarm, Agent
+from swarm.session import JsonlStore, MemoryStore, SQLiteStore
+from tests.mock_client import AsyncMockOpenAIClient, MockOpenAIClient, create_mock_response
+
+
+def transfer_to_agent2():
+    return agent2
+
+
+agent1 = Agent(name="Agent 1", functions=[transfer_to_agent2])
+agent2 = Agent(name="Agent 2")
+
+
+def handoff_then_replies(mock):
+    mock.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""}, [{"name": "transfer_to_agent2"}]
+            ),
+            create_mock_response({"role": "assistant", "content": "first"}),
+            create_mock_response({"role": "assistant", "content": "second"}),
+        ]
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite", "jsonl"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    if request.param == "sqlite":
+        return SQLiteStore(str(tmp_path / "sessions.sqlite"))
+    return JsonlStore(str(tmp_path / "sessions"))
+
+
+def test_session_persists_history_agent_and_context(store):
+    mock = MockOpenAIClient()
+    handoff_then_replies(mock)
+    client = Swarm(client=mock, session_store=store)
+
+    session = client.session("s1", agent1)
+    session.send("hi")
+    response = session.send({"role": "user", "content": "again"})
+
+    sent = mock.chat.completions.create.call_args.kwargs["messages"]
+    assert [m["content"] for m in sent if m["role"] == "user"] == ["hi", "again"]
+    assert response.messages[-1]["content"] == "second"
+
+    reloaded = client.session("s1", agent1, agents=[agent2])
+    assert reloaded.messages == session.messages
+    assert len(reloaded.messages) == 6
+    assert reloaded.agent.name == "Agent 2"
+    assert client.session("s2", agent1).messages == []
+
+
+def test_failed_turn_leaves_session_unchanged():
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses([RuntimeError("down")])
+    store = MemoryStore()
+    session = Swarm(client=mock, session_store=store).session("s1", agent1)
+
+    with pytest.raises(RuntimeError):
+        session.send("hi")
+
+    assert session.messages == []
+    assert store.load("s1") is None
+
+
+@pytest.mark.parametrize("store_class", [SQLiteStore, JsonlStore])
+def test_values_that_do_not_round_trip_fail_loudly(store_class, tmp_path):
+    mock = MockOpenAIClient()
+    mock.set_response(create_mock_response({"role": "assistant", "content": "hi"}))
+    store = store_class(str(tmp_path / "sessions"))
+    session = Swarm(client=mock, session_store=store).session("s1", agent1)
+    session.context_variables = {"since": date(2024, 1, 1)}
+
+    with pytest.raises(TypeError):
+        session.send("hi")
+
+    assert session.messages == []
+    assert store.load("s1") is None
+
+
+def test_unknown_agent_on_reload():
+    mock = MockOpenAIClient()
+    handoff_then_replies(mock)
+    client = Swarm(client=mock)
+    client.session("s1", agent1).send("hi")
+
+    with pytest.raises(ValueError, match="Agent 2"):
+        client.session("s1", agent1)
+
+
+def test_async_session(tmp_path):
+    mock = AsyncMockOpenAIClient()
+    handoff_then_replies(mock)
+    client = AsyncSwarm(client=mock, session_store=JsonlStore(str(tmp_path)))
+
+    async def converse():
+        session = client.session("s1", agent1)
+        await session.send("hi")
+        return await session.send("again")
+
+    response = asyncio.run(converse())
+    assert response.agent.name == "Agent 2"
+    assert len(client.session("s1", agent1, agents=[agent2]).messages) == 6
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from swarm import Swarm, Agent
+from swarm.tracing import JsonlSpanExporter, Tracer
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def read_spans(path):
+    spans = []
+    for line in open(path):
+        (resource,) = json.loads(line)["resourceSpans"]
+        assert resource["resource"]["attributes"][0]["key"] == "service.name"
+        for scope in resource["scopeSpans"]:
+            spans.extend(scope["spans"])
+    return spans
+
+
+def test_span_tree(tmp_path):
+    def transfer_to_agent2():
+        return agent2
+
+    agent1 = Agent(name="Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Agent 2")
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""}, [{"name": "transfer_to_agent2"}]
+            ),
+            create_mock_response({"role": "assistant", "content": "Hi from agent 2"}),
+        ]
+    )
+    exporter = JsonlSpanExporter(tmp_path / "spans.jsonl")
+    client = Swarm(client=mock, hooks=[Tracer(exporter)])
+
+    client.run(
+        agent=agent1, messages=[{"role": "user", "content": "hi"}], context_variables={"user": "ann"}
+    )
+    exporter.shutdown()
+
+    spans = read_spans(tmp_path / "spans.jsonl")
+    by_name = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+    run = by_name["swarm.run"][0]
+    turns = by_name["swarm.turn"]
+    tool = by_name["swarm.tool"][0]
+    handoff = by_name["swarm.handoff"][0]
+    assert len(turns) == len(by_name["swarm.llm"]) == 2
+    assert {s["traceId"] for s in spans} == {run["traceId"]}
+    assert "parentSpanId" not in run
+    assert all(t["parentSpanId"] == run["spanId"] for t in turns)
+    assert tool["parentSpanId"] == handoff["parentSpanId"] == turns[0]["spanId"]
+    assert {"key": "swarm.tool.name", "value": {"stringValue": "transfer_to_agent2"}} in tool[
+        "attributes"
+    ]
+    assert {"key": "swarm.handoff.to", "value": {"stringValue": "Agent 2"}} in handoff[
+        "attributes"
+    ]
+    assert all(int(s["startTimeUnixNano"]) <= int(s["endTimeUnixNano"]) for s in spans)
+    assert run["status"] == {"code": 1}
+    context_keys = {
+        "key": "swarm.context_variables",
+        "value": {"arrayValue": {"values": [{"stringValue": "user"}]}},
+    }
+    assert context_keys in run["attributes"]
+    assert all(context_keys in t["attributes"] for t in turns)
+
+
+def test_failed_run_closes_spans(tmp_path):
+    def broken():
+        raise RuntimeError("boom")
+
+    mock = MockOpenAIClient()
+    mock.set_response(
+        create_mock_response({"role": "assistant", "content": ""}, [{"name": "broken"}])
+    )
+    exporter = JsonlSpanExporter(tmp_path / "spans.jsonl")
+    client = Swarm(client=mock, hooks=[Tracer(exporter)])
+
+    with pytest.raises(RuntimeError):
+        client.run(agent=Agent(functions=[broken]), messages=[])
+    exporter.flush()
+
+    spans = {s["name"]: s for s in read_spans(tmp_path / "spans.jsonl")}
+    assert set(spans) == {"swarm.run", "swarm.turn", "swarm.llm", "swarm.tool"}
+    assert spans["swarm.tool"]["status"]["code"] == 2
+    assert "boom" in spans["swarm.run"]["status"]["message"]
@@ -1,4 +1,7 @@
-from swarm.util import function_to_json
+import json
+
+from swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
+from swarm.util import StreamAccumulator, function_to_json, model_to_dict
 
 
 def test_basic_function():
@@ -48,3 +51,85 @@ def test_complex_function():
             },
         },
     }
+
+
+def test_model_to_dict_matches_json_round_trip():
+    message = ChatCompletionMessage(
+        role="assistant",
+        content="hello",
+        tool_calls=[
+            ChatCompletionMessageToolCall(
+                id="call_1",
+                type="function",
+                function=Function(name="get_weather", arguments='{"location": "SF"}'),
+            )
+        ],
+    )
+    message.sender = "Agent"
+
+    result = model_to_dict(message)
+    assert result == json.loads(message.model_dump_json())
+    assert result["tool_calls"][0]["function"]["name"] == "get_weather"
+    assert result["sender"] == "Agent"
+
+
+def test_stream_accumulator():
+    accumulator = StreamAccumulator(sender="Agent")
+    accumulator.add({"role": "assistant", "content": "Hel"})
+    snapshot = accumulator.message()
+    assert snapshot["content"] == "Hel"
+    assert accumulator.message() is snapshot
+
+    accumulator.add({"content": "lo"})
+    # one chunk carrying fragments of two tool calls
+    accumulator.add(
+        {
+            "content": None,
+            "tool_calls": [
+                {
+                    "index": 0,
+                    "id": "call_1",
+                    "type": "function",
+                    "function": {"name": "get_weather", "arguments": '{"loc'},
+                },
+                {
+                    "index": 1,
+                    "id": "call_2",
+                    "type": "function",
+                    "function": {"name": "get_time", "arguments": "{}"},
+                },
+            ],
+        }
+    )
+    accumulator.add(
+        {"tool_calls": [{"index": 0, "function": {"arguments": 'ation": "SF"}'}}]}
+    )
+
+    message = accumulator.message()
+    assert message["content"] == "Hello"
+    assert message["sender"] == "Agent"
+    assert message["tool_calls"] == [
+        {
+            "function": {"arguments": '{"location": "SF"}', "name": "get_weather"},
+            "id": "call_1",
+            "type": "function",
+        },
+        {
+            "function": {"arguments": "{}", "name": "get_time"},
+            "id": "call_2",
+            "type": "function",
+        },
+    ]
+
+
+def test_stream_accumulator_without_tool_calls():
+    accumulator = StreamAccumulator(sender="Agent")
+    accumulator.add({"role": "assistant", "content": None})
+
+    assert accumulator.message() == {
+        "content": "",
+        "sender": "Agent",
+        "role": "assistant",
+        "function_call": None,
+        "tool_calls": None,
+    }